@@ -14,6 +14,12 @@
 
 import numpy as np
 import pandas as pd
+import matplotlib
+try:
+    get_ipython()
+except NameError:
+    # Running as a plain script: draw off-screen and save the figures instead
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib import style
 import pvlib
@@ -25,12 +31,21 @@ import os
 # In[2]:
 
 
-plt.rcParams['timezone'] = 'Etc/GMT+7'
-font = {'family' : 'DejaVu Sans',
-'weight' : 'normal',
-'size'   : 18}
-plt.rc('font', **font)
-plt.rcParams['figure.figsize'] = (12, 5)
+# Plot style, applied to each figure with plt.rc_context(PLOT_CTX) instead of
+# changing matplotlib's global settings
+PLOT_CTX = {'timezone': 'Etc/GMT+7',
+            'font.family': 'DejaVu Sans',
+            'font.weight': 'normal',
+            'font.size': 18,
+            'figure.figsize': (12, 5)}
+
+def show(filename):
+    # Display the figure in Jupyter, save it to filename when run as a script
+    if matplotlib.get_backend().lower() == 'agg':
+        plt.savefig(filename, bbox_inches='tight')
+        plt.close()
+    else:
+        plt.show()
 
 
 # In[3]:
@@ -45,6 +60,15 @@ import pySMARTS
 pySMARTS.__version__
 
 
+# In[ ]:
+
+
+# pySMARTS runs SMARTS from this folder (it does not change the working
+# directory), so pass SMARTSPATH to every call or set the SMARTSPATH
+# environment variable.
+SMARTSPATH = r'C:\Users\sayala\Documents\GitHub\py-SMARTS\SMARTS'
+
+
 # #### Real Input data from SRRL for OCTOBER 21st, 12:45 PM
 
 # # 1. Plot a DNI and DHI for a particular time and location
@@ -72,7 +96,7 @@ ZONE = '-7' # Timezone
 # In[ ]:
 
 
-pySMARTS.SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE)
+pySMARTS.SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, SMARTSPATH=SMARTSPATH)
 
 
 # # 2. Plot Albedos from SMARTS
@@ -90,39 +114,44 @@ IOUT = '30' # Albedo
 
 materials = ['Concrete', 'LiteLoam', 'RConcrte', 'Gravel']
 
-alb_db = pd.DataFrame()
-
-for i in range (0, len(materials)):
+# Keep the SMARTS results on disk, so running the notebook again reuses them
+# instead of calling SMARTS (pySMARTS.clear_cache() removes them).
+pySMARTS.set_cache('.cache')
 
-    alb = pySMARTS.SMARTSAirMass(IOUT=IOUT, AMASS='1.5', material=materials[i])
+# One SMARTS run per material
+results = pySMARTS.SMARTSAirMassMaterials(IOUT, materials, '1.5', SMARTSPATH=SMARTSPATH)
 
-    alb_db[materials[i]] = alb[alb.keys()[1]]
-    
-alb_db.index = alb.Wvlgth
+# Allocate the table once and fill it column by column
+alb = results[materials[0]]
+alb_db = pd.DataFrame(np.empty((len(alb), len(materials)), dtype=np.float32),
+                      index=alb.Wvlgth, columns=materials)
+for i, m in enumerate(materials):
+    alb_db.iloc[:, i] = results[m].iloc[:, 1].to_numpy(dtype=np.float32)
 
 alb_db_10 = alb_db
 
-for col in alb_db:
-    alb_db[col].plot(legend=True)
-    
-plt.xlabel('Wavelength [nm]')
-plt.xlim([300, 2500])
-plt.axhline(y=0.084, color='r')
-plt.axhline(y=0.10, color='r')
+with plt.rc_context(PLOT_CTX):
+    ax = alb_db.plot(legend=True)
+
+    ax.set_xlabel('Wavelength [nm]')
+    ax.set_xlim([300, 2500])
+    ax.axhline(y=0.084, color='r')
+    ax.axhline(y=0.10, color='r')
 
-#UV albedo: 295 to 385
-#Total albedo: 300 to 3000
-#10.4 and 8.4 $ Measured
-#References
+    #UV albedo: 295 to 385
+    #Total albedo: 300 to 3000
+    #10.4 and 8.4 $ Measured
+    #References
 
-plt.ylim([0,1])
-plt.ylabel('Reflectance')
-plt.legend(bbox_to_anchor=(1.04,0.75), loc="upper left")
-plt.title('Ground albedos AM 1')
-plt.show()
+    ax.set_ylim([0,1])
+    ax.set_ylabel('Reflectance')
+    ax.legend(bbox_to_anchor=(1.04,0.75), loc="upper left")
+    ax.set_title('Ground albedos AM 1')
+    show('Ground_albedos_AM1.png')
 
-vis=alb_db.iloc[40:1801].mean()
-uv=alb_db.iloc[30:210].mean()
+# Visible (300-2995 nm) and UV (295-384.5 nm) averages in a single pass
+vis, uv = (pd.Series(m, index=alb_db.columns) for m in
+           pySMARTS.band_means(alb_db.index, alb_db.values, [(300, 2995), (295, 384.5)]))
 
 print(vis)
 print(uv)
@@ -134,8 +163,9 @@ print(uv)
 # In[ ]:
 
 
-vis=alb_db.iloc[40:1801].mean()
-uv=alb_db.iloc[30:210].mean()
+# Visible (300-2995 nm) and UV (295-384.5 nm) averages in a single pass
+vis, uv = (pd.Series(m, index=alb_db.columns) for m in
+           pySMARTS.band_means(alb_db.index, alb_db.values, [(300, 2995), (295, 384.5)]))
 print("Albedo on Visible Range:\n", vis)
 print("Albedo on UV Range:\n", uv)
 
@@ -146,11 +176,17 @@ print("Albedo on UV Range:\n", uv)
 # In[68]:
 
 
-r = pd.RangeIndex(2800,40000, 5)
-r = r/10
-alb2 = alb_db.reindex(r, method='ffill')
+# Forward-fill onto a uniform 0.5 nm grid: for each target wavelength, take
+# the last SMARTS wavelength at or below it.
+tgt = pySMARTS.WL_HALF_NM_GRID
+alb2 = pd.DataFrame(pySMARTS.ffill_align(alb_db.index, alb_db.values, tgt),
+                    index=tgt, columns=alb_db.columns)
 print("Albedo for all wavelengths:", alb2.mean())
 
+# Same idea without resampling: weight each SMARTS wavelength step by its width
+full = pySMARTS.band_average(alb_db.index, alb_db.values, 280, 4000)
+print("Albedo for all wavelengths (trapezoidal):\n", pd.Series(full, index=alb_db.columns))
+
 
 # In[74]:
 
@@ -217,8 +253,6 @@ W = str(7.9/10)   # SRRL-PWD  Precipitable Water [mm]
 
 material = 'DryGrass'
 
-alb_db = pd.DataFrame()
-
 alb = pySMARTS.SMARTSSRRL(
     IOUT=IOUT, YEAR=YEAR, MONTH=MONTH,DAY=DAY, HOUR='12.45', LATIT=LATIT, 
     LONGIT=LONGIT, ALTIT=ALTIT, 
@@ -227,23 +261,24 @@ alb = pySMARTS.SMARTSSRRL(
     TILT=TILT, WAZIM=WAZIM,
     ALPHA1 = ALPHA, ALPHA2 = 0, OMEGL = OMEGL,
     GG = GG, BETA = BETA,
-    RHOG=RHOG, HEIGHT=HEIGHT, material=material, POA = True)
+    RHOG=RHOG, HEIGHT=HEIGHT, material=material, POA = True,
+    SMARTSPATH=SMARTSPATH)
 
-alb_db[material] = alb[alb.keys()[1]]   
-alb_db.index = alb.Wvlgth
+alb_db = pd.DataFrame({material: alb.iloc[:, 1].values}, index=alb.Wvlgth)
 
 
 # In[ ]:
 
 
-alb_db[material].plot(legend=True, color='y')
-plt.xlabel('Wavelength [nm]')
-plt.xlim([300, 2500])
-plt.ylim([0,1])
-plt.ylabel('Reflectance')
-plt.legend(bbox_to_anchor=(1.04,0.75), loc="upper left")
-plt.title('Albedo @ 12.45 Oct 21, 2020 for SRRL Weather Data ')
-plt.show()
+with plt.rc_context(PLOT_CTX):
+    alb_db[material].plot(legend=True, color='y')
+    plt.xlabel('Wavelength [nm]')
+    plt.xlim([300, 2500])
+    plt.ylim([0,1])
+    plt.ylabel('Reflectance')
+    plt.legend(bbox_to_anchor=(1.04,0.75), loc="upper left")
+    plt.title('Albedo @ 12.45 Oct 21, 2020 for SRRL Weather Data ')
+    show('Albedo_SRRL.png')
 
 
 # ### A plotly plot to explore the results
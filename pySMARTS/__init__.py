@@ -9,4 +9,4 @@ try:
 except PackageNotFoundError:
     __version__ = "0+unknown"
 
-from pySMARTS.main import SMARTSTimeLocation, SMARTSAirMass, SMARTSSpectraZenAzm, SMARTSTMY3, SMARTSSRRL
\ No newline at end of file
+from pySMARTS.main import SMARTSTimeLocation, SMARTSTimeLocationBatch, SMARTSAirMass, SMARTSSpectraZenAzm, SMARTSSpectraZenAzmLUT, SMARTSTMY3, SMARTSSRRL, SMARTSAirMassMaterials, SMARTSRunMany, material_albedo, SMARTSConfig, SpectralBundle, SpectralLUT, set_cache, clear_cache, band_average, band_means, ffill_align, WL_HALF_NM_GRID
\ No newline at end of file
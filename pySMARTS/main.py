@@ -16,215 +16,231 @@ by Silvana Ayala (2019-2020). Original Matlab wrapper was made for graduate stud
 at the University of Arizona, python porting by NREL. 
 
 Please read the license and Readme files for more information, proper use, citing, and copyrights.
-    
+
 """
 
-def IOUT_to_code(IOUT):
-    r''' Function to display the options of outputs that SMARTS has. 
-     If run without input (IOUT = None), it prints in a list all possible outputs.
-     If IOUT is passed to equal one of the outputs (i.e. 
-     (i.e. IOUT = 'Global horizontal irradiance W m-2'), it returns the
-     code number for that output (returns '4' for this example).
-     
-     PARAMETERS
-     -----------
-     IOUT: String
-           Can be None or a SMARTS output description
-          
-     RETURNS
-     -------
-     IOUT_Key: String
-          Key code to SMARTS cards input.
+import collections
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import typing
+import warnings
+
+import numpy as np
+
+# Uniform 0.5 nm wavelength grid spanning the full SMARTS range, [nm].
+WL_HALF_NM_GRID = np.arange(280.0, 4000.0, 0.5, dtype=np.float32)
+WL_HALF_NM_GRID.flags.writeable = False
+
+
+# Cards SMARTS reads as integers: option flags, dates and output codes. They
+# keep their text in cache keys since i.e. '0.0' is not a valid flag even
+# though it equals '0'.
+_INTEGER_CARDS = frozenset(('ISPR', 'IATMOS', 'IH2O', 'IO3', 'IALT', 'IGAS', 'ILOAD', 'ISPCTR',
+                            'ITURB', 'IALBDX', 'ITILT', 'IALBDG', 'IPRT', 'IOUT', 'ICIRC',
+                            'ISCAN', 'IFILT', 'ILLUM', 'IUV', 'IMASS', 'YEAR', 'MONTH', 'DAY'))
+
+
+def _canonical(value):
+    r''' Normalizes an argument so equivalent inputs share a cache key, i.e.
+    '1.0', '1.00' and 1 all map to 1.0, and '2  3' maps to '2 3'. Integer
+    cards of a SMARTSConfig only have their spacing normalized.
+    '''
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, SMARTSConfig):
+        return tuple(' '.join(str(v).split()) if name in _INTEGER_CARDS else _canonical(v)
+                     for name, v in zip(value._fields, value))
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return ' '.join(value.split())
+    if isinstance(value, tuple):
+        return tuple(_canonical(v) for v in value)
+    return value
+
+
+# Optional on-disk cache shared between processes and sessions; see set_cache.
+_DISK_CACHE = {'path': None, 'round_ndigits': {}}
+
+
+def _rounded(cfg):
+    r''' Rounds the cards listed in the disk cache settings, so nearby inputs
+    (i.e. neighbouring pixels of a grid) share one SMARTS run.
+    '''
+    changes = {}
+    for name, ndigits in _DISK_CACHE['round_ndigits'].items():
+        try:
+            changes[name] = '{:.{}f}'.format(float(getattr(cfg, name)), ndigits)
+        except ValueError:
+            pass  # Blank or non-numeric card.
+    return cfg._replace(**changes)
 
-     '''
 
-    IOUT_map = { 'Extraterrestrial spectrum W m-2':     '1', 
-            'Direct normal irradiance W m-2':     '2',
-            'Diffuse horizontal irradiance W m-2':     '3',
-            'Global horizontal irradiance W m-2':     '4',
-            'Direct horizontal irradiance W m-2':     '5',
-            'Direct tilted irradiance W m-2':     '6',
-            'Diffuse tilted irradiance W m-2':     '7',
-            'Global tilted irradiance W m-2':     '8',
-            'Experimental direct normal irradiance (with circumsolar) W m-2':     '9',
-            'Experimental diffuse horizontal irradiance W m-2':     '10',
-            'Circumsolar irradiance within radiometer field of view W m-2':     '11',
-            'Global tilted photon flux per wavelength cm-2 s-1 nm-1':     '12*',
-            'Direct normal photon flux per wavelength cm-2 s-1 nm-1':     '13',
-            'Diffuse horizontal photon flux per wavelength cm-2 s-1 nm-1':     '14',
-            'Rayleigh transmittance':     '15',
-            'Ozone transmittance':     '16',
-            'Transmittance from all trace gases':     '17',
-            'Water vapor transmittance':     '18',
-            'Mixed gas transmittance':     '19',
-            'Aerosol transmittance':     '20',
-            'Beam radiation transmittance':     '21',
-            'Rayleigh optical thickness':     '22',
-            'Ozone optical thickness':     '23',
-            'Optical thickness from all trace gases':     '24',
-            'Water vapor optical thickness':     '25',
-            'Mixed gas optical thickness':     '26',
-            'Aerosol optical thickness':     '27',
-            'Aerosol single scattering albedo':     '28',
-            'Aerosol asymmetry factor':     '29',
-            'Zonal surface reflectance':     '30',
-            'Local ground reflectance':     '31',
-            'Atmospheric reflectance':     '32',
-            'Global foreground reflected irradiance on tilted surface W m-2':     '33*',
-            'Upward hemispheric ground-reflected irradiance W m-2':     '34*',
-            'Global horizontal photosynthetic photon flux ?mol m-2 s-1 nm-1':     '35*',
-            'Direct normal photosynthetic photon flux ?mol m-2 s-1 nm-1':     '36*',
-            'Diffuse horizontal photosynthetic photon flux ?mol m-2 s-1 nm-1':     '37*',
-            'Global tilted photosynthetic photon flux ?mol m-2 s-1 nm-1':     '38*',
-            'Spectral photonic energy eV':     '39*',
-            'Global horizontal photon flux per eV cm-2 s-1 eV-1':     '40*',
-            'Direct normal photon flux per eV cm-2 s-1 eV-1':     '41*',
-            'Diffuse horizontal photon flux per eV cm-2 s-1 eV-1':     '42*',
-            'Global tilted photon flux per eV cm-2 s-1 eV-1':     '43*'
-            }
-    
-    if not IOUT:
-        return list(IOUT_map.keys())
-    if IOUT not in IOUT_map:
-        print(f"Unknown output specified: '{IOUT}'")
-        return None
-    return IOUT_map.get(IOUT)
+def _disk_file(key):
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(_DISK_CACHE['path'], digest + '.npz')
 
-    
-def _material_to_code(material):
-    # Comments include Description, File name(.DAT extension), Reflection, Type*, Spectral range(um), Category*
-    # *KEYS: L Lambertian, NL Non-Lambertian, SP Specular, M Manmade materials, S Soils and rocks, U User defined, V Vegetation, W Water, snow, or ice
-    material_map = { 'UsrLamb':     '0',  # User-defined spectral reflectance Albedo L Userdefined
-                     'UsrNLamb':    '1',  # User-defined spectral reflectance Albedo NL Userdefined
-                     'Water':       '2',  # Water or calm ocean (calculated) SP 0.28 4.0 W
-                     'Snow':        '3',  # Fresh dry snow Snow NL 0.3 2.48 W
-                     'Neve':        '4',  # Snow on a mountain neve Neve NL 0.45 1.65 W
-                     'Basalt':      '5',  # Basalt rock Basalt NL 0.3 2.48 S
-                     'Dry_sand':    '6',  # Dry sand Dry_sand NL 0.32 0.99 S
-                     'WiteSand':    '7',  # Sand from White Sands, NM WiteSand NL 0.5 2.48 S
-                     'Soil':        '8',  # Bare soil Soil NL 0.28 4.0 S
-                     'Dry_clay':    '9',  # Dry clay soil Dry_clay NL 0.5 2.48 S
-                     'Wet_clay':    '10', # Wet clay soil Wet_clay NL 0.5 2.48 S
-                     'Alfalfa':     '11', # Alfalfa Alfalfa NL 0.3 0.8 V
-                     'Grass':       '12', # Green grass Grass NL 0.3 1.19 V
-                     'RyeGrass':    '13', # Perennial rye grass RyeGrass NL 0.44 2.28 V
-                     'Meadow1':     '14', # Alpine meadow Meadow1 NL 0.4 0.85 V
-                     'Meadow2':     '15', # Lush meadow Meadow2 NL 0.4 0.9 V
-                     'Wheat':       '16', # Wheat crop Wheat NL 0.42 2.26 V
-                     'PineTree':    '17', # Ponderosa pine tree PineTree NL 0.34 2.48 V
-                     'Concrete':    '18', # Concrete slab Concrete NL 0.3 1.3 M
-                     'BlckLoam':    '19', # Black loam BlckLoam NL 0.4 4.0 S
-                     'BrwnLoam':    '20', # Brown loam BrwnLoam NL 0.4 4.0 S
-                     'BrwnSand':    '21', # Brown sand BrwnSand NL 0.4 4.0 S
-                     'Conifers':    '22', # Conifer trees Conifers NL 0.302 4.0 V
-                     'DarkLoam':    '23', # Dark loam DarkLoam NL 0.46-4.0 S
-                     'DarkSand':    '24', # Dark sand DarkSand NL 0.4 4.0 S
-                     'Decidous':    '25', # Decidous trees Decidous NL 0.302 4.0 V
-                     'DryGrass':    '26', # Dry grass (sod) DryGrass NL 0.38 4.0 V
-                     'DuneSand':    '27', # Dune sand DuneSand NL 0.4 4.0 S
-                     'FineSnow':    '28', # Fresh fine snow FineSnow NL 0.3 4.0 W
-                     'GrnGrass':    '29', # Green rye grass (sod) GrnGrass NL 0.302 4.0 V
-                     'GrnlSnow':    '30', # Granular snow GrnlSnow NL 0.3 4.0 W
-                     'LiteClay':    '31', # Light clay LiteClay NL 0.4 4.0 S
-                     'LiteLoam':    '32', # Light loam LiteLoam NL 0.431 4.0 S
-                     'LiteSand':    '33', # Light sand LiteSand NL 0.4 4.0 S
-                     'PaleLoam':    '34', # Pale loam PaleLoam NL 0.4 4.0 S
-                     'Seawater':    '35', # Sea water Seawater NL 2.079 4.0 W
-                     'SolidIce':    '36', # Solid ice SolidIce NL 0.3 4.0 W
-                     'Dry_Soil':    '37', # Dry soil Dry_Soil NL 0.28 4.0 S
-                     'LiteSoil':    '38', # Light soil LiteSoil NL 0.28 4.0 S
-                     'RConcrte':    '39', # Old runway concrete RConcrte NL 0.3 4.0 M
-                     'RoofTile':    '40', # Terracota roofing clay tile RoofTile NL 0.3 4.0 M
-                     'RedBrick':    '41', # Red construction brick RedBrick NL 0.3 4.0 M
-                     'Asphalt':     '42', # Old runway asphalt Asphalt NL 0.3 4.0 M
-                     'TallCorn':    '43', # Tall green corn TallCorn NL 0.36-1.0 V
-                     'SndGravl':    '44', # Sand & gravel SndGravl NL 0.45-1.04 S
-                     'Fallow':      '45', # Fallow field Fallow NL 0.32-1.19 S
-                     'Birch':       '46', # Birch leaves Birch NL 0.36-2.48 V
-                     'WetSoil':     '47', # Wet sandy soil WetSSoil NL 0.48-2.48 S
-                     'Gravel':      '48', # Gravel Gravel NL 0.32-1.3 S
-                     'WetClay2':    '49', # Wet red clay WetClay2 NL 0.52-2.48 S
-                     'WetSilt':     '50', # Wet silt WetSilt NL 0.52-2.48 S
-                     'LngGrass':    '51', # Dry long grass LngGrass NL 0.277-2.976 V
-                     'LwnGrass':    '52', # Lawn grass (generic bluegrass) LwnGrass NL 0.305-2.944 V
-                     'OakTree':     '53', # Deciduous oak tree leaves OakTree NL 0.35-2.5 V
-                     'Pinion':      '54', # Pinion pinetree needles Pinion NL 0.301-2.592 V
-                     'MeltSnow':    '55', # Melting snow (slush) MeltSnow NL 0.35-2.5 W
-                     'Plywood':     '56', # Plywood sheet (new, pine, 4-ply) Plywood NL 0.35-2.5 M
-                     'WiteVinl':    '57', # White vinyl plastic sheet, 0.15 mm WiteVinl NL 0.35-2.5 M
-                     'FibrGlss':    '58', # Clear fiberglass greenhouse roofing FibrGlss NL 0.35-2.5 M
-                     'ShtMetal':    '59', # Galvanized corrugated sheet metal, new ShtMetal NL 0.35-2.5 M
-                     'Wetland':     '60', # Wetland vegetation canopy, Yellowstone Wetland NL 0.409-2.478 V
-                     'SageBrsh':    '61', # Sagebrush canopy, Yellowstone SageBrsh NL 0.409-2.478 V
-                     'FirTrees':    '62', # Fir trees, Colorado FirTrees NL 0.353-2.592 V
-                     'CSeaWatr':    '63', # Coastal seawater, Pacific CSeaWatr NL 0.277-2.976 W
-                     'OSeaWatr':    '64', # Open ocean seawater, Atlantic OSeaWatr NL 0.277-2.976 W
-                     'GrazingField':'65', # Grazing field (unfertilized) GrazingField NL 0.401-2.499 V
-                     'Spruce':      '66'  # Young Norway spruce tree (needles) Spruce NL 0.39-0.845 V
-                }
-    
-    if not material:
-        return material_map.keys()
-    if material not in material_map:
-        print(f"Unknown material specified: '{material}'")
+
+def _disk_load(key):
+    if _DISK_CACHE['path'] is None or not os.path.exists(_disk_file(key)):
         return None
-    return material_map.get(material)
+    with np.load(_disk_file(key), allow_pickle=False) as stored:
+        return _smarts_frame(stored['columns'].tolist(), stored['values'])
 
-def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, material='LiteSoil', min_wvl='280', max_wvl='4000', SMARTSPATH=None):
-    r'''
-    This function calculates the spectral albedo for a given material. If no 
-    material is provided, the function will return a list of all valid 
-    materials.
 
-    Parameters
-    ----------
-    material : string
-        Unique identifier for ground cover. Pass None to retreive a list of
-        all valid materials.
-    WLMN : string
-        Minimum wavelength to retreive
-    WLMX : string
-        Maximum wavelength to retreive
-    YEAR : string
-        Year
-    MONTH : string
-        Month
-    DAY : string
-        Day
-    HOUR : string
-        Hour, in 24 hour format.
-    LATIT : string
-        Latitude of the location.
-    LONGIT : string
-        Longitude of the location.
-    ALTIT : string
-        elevation of the ground surface above sea level [km]
-    ZONE : string
-        Timezone
+def _disk_store(key, data):
+    if _DISK_CACHE['path'] is None:
+        return
+    # Write to a temporary file first so other processes never read a
+    # partial result.
+    fd, tmp = tempfile.mkstemp(dir=_DISK_CACHE['path'], suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(f, values=data.to_numpy(), columns=np.array(data.columns, dtype=str))
+    os.replace(tmp, _disk_file(key))
 
 
-    Returns
-    -------
-    data : pandas
-        Matrix with first column representing wavelength (in nm) and second
-        column representing albedo of specified material at the wavelength
-    
-    Updates:
-           6/20 Creation of second function to use zenith and azimuth M. Monarch
+def _smarts_dir(SMARTSPATH=None):
+    r''' SMARTS folder a run uses: the SMARTSPATH environment variable if set,
+    else the SMARTSPATH argument, else the current working directory.
+    '''
+    return os.path.abspath(os.environ.get('SMARTSPATH', SMARTSPATH) or os.getcwd())
+
+
+def _cached(func, maxsize=1024):
+    r''' Memoizes a SMARTS call on its (normalized) arguments, so calling it
+    again with the same inputs returns the previous result instead of
+    launching SMARTS again. A SMARTSPATH argument is replaced by the folder
+    actually used (see _smarts_dir). A copy is returned so callers can modify
+    it freely. Only the maxsize most recently used results are kept in
+    memory, so long sweeps don't hold on to every spectrum. Use
+    ``func.cache_clear()`` to empty the cache. Results are also kept on disk
+    if a folder was given to ``set_cache``.
+    '''
+    signature = inspect.signature(func)
+    cache = collections.OrderedDict()
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if 'SMARTSPATH' in bound.arguments:
+            bound.arguments['SMARTSPATH'] = _smarts_dir(bound.arguments['SMARTSPATH'])
+        for k, v in bound.arguments.items():
+            if isinstance(v, SMARTSConfig) and _DISK_CACHE['round_ndigits']:
+                bound.arguments[k] = _rounded(v)
+        key = tuple((k, _canonical(v)) for k, v in bound.arguments.items())
+        with lock:
+            data = cache.get(key)
+            if data is not None:
+                cache.move_to_end(key)
+                return data.copy()
+        data = _disk_load(key)
+        if data is None:
+            # SMARTS runs outside the lock (each run has its own scratch
+            # folder), so threads with different inputs don't wait on each other.
+            data = func(*bound.args, **bound.kwargs)
+            if data is None:
+                return None
+            _disk_store(key, data)
+        with lock:
+            data = cache.setdefault(key, data)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+        return data.copy()
+
+    def cache_clear():
+        with lock:
+            cache.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+class SpectralBundle(typing.NamedTuple):
+    r''' SMARTS results kept as plain float32 arrays: the wavelengths [nm],
+    a (wavelengths x outputs) matrix of values and the output names. Use
+    ``to_pandas()`` to get a DataFrame indexed by wavelength.
+    '''
+    wl: np.ndarray
+    values: np.ndarray
+    names: list
+
+    @classmethod
+    def from_pandas(cls, data):
+        # First column holds the wavelengths, as in the SMARTS output file.
+        return cls(data.iloc[:, 0].to_numpy(dtype=np.float32),
+                   data.iloc[:, 1:].to_numpy(dtype=np.float32),
+                   list(data.columns[1:]))
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.values, index=pd.Index(self.wl, name='Wvlgth'), columns=self.names)
+
+
+class SpectralLUT(typing.NamedTuple):
+    r''' SMARTS results precomputed on a grid of sun positions: zeniths and
+    azimuths [deg] (ascending), wavelengths [nm] and a (zeniths x azimuths x
+    wavelengths x outputs) float32 array of values. Calling it with a sun
+    position interpolates bilinearly in the grid instead of running SMARTS;
+    positions outside the grid take the value at its edge.
+    '''
+    zeniths: np.ndarray
+    azimuths: np.ndarray
+    wl: np.ndarray
+    values: np.ndarray
+    names: list
+
+    def __call__(self, zenith, azimuth):
+        r''' Values at the given sun position(s), as a (wavelengths x outputs)
+        array, or (positions x wavelengths x outputs) for array inputs.
+        '''
+        def weights(grid, x):
+            x = np.asarray(x, dtype=float)
+            i = np.clip(np.searchsorted(grid, x, side='right') - 1, 0, len(grid) - 2)
+            t = np.clip((x - grid[i]) / (grid[i + 1] - grid[i]), 0.0, 1.0)
+            return i, t[..., None, None]
+
+        iz, tz = weights(self.zeniths, zenith)
+        ia, ta = weights(self.azimuths, azimuth)
+        v = self.values
+        return ((1 - tz) * ((1 - ta) * v[iz, ia] + ta * v[iz, ia + 1]) +
+                tz * ((1 - ta) * v[iz + 1, ia] + ta * v[iz + 1, ia + 1])).astype(np.float32)
+
+
+class SMARTSConfig(typing.NamedTuple):
+    r''' Values of all the cards of a SMARTS input file, as strings. The
+    defaults describe a U.S. Standard Atmosphere at sea-level pressure over
+    LiteSoil, with the sun position still to be given on Card 17a. Use
+    ``_replace`` to change any card, i.e.
+    ``SMARTSConfig()._replace(IMASS='2', AMASS='1.5')``, and
+    ``SMARTSRunMany`` to run a list of them.
     '''
 
     ## Card 1: Comment. 64 characters max. In theory no spaces but yes underscores.
-    CMNT = 'ASTMG173-03 (AM1.5 Standard)'
-    
+    CMNT: str = 'ASTMG173-03 (AM1.5 Standard)'
+
     ## Card 2: ISPR is an option for site's pressure.
     # ISPR = 0 to input SPR on Card 2a
     # ISPR = 1 to input SPR, ALTIT and HEIGHT on Card 2a
     # ISPR = 2 to input LATIT, ALTIT and HEIGHT on Card 2a.
-    ISPR = '1'
-    
+    ISPR: str = '0'
+
     # Card 2a (if ISPR = 0): SPR
-    SPR = '1013.25' #mbar
-    
+    SPR: str = '1013.25'  #mbar
+
     # Card 2a (if ISPR = 1): SPR, ALTIT, HEIGHT
     # SPR: Surface pressure (mb).
     # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
@@ -233,7 +249,7 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # <= 100 km (new input).
     # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
     # must be <= 100 km.
-    
+
     # Card 2a (if ISPR = 2): LATIT, ALTIT, HEIGHT
     # LATIT: Site's latitude (decimal degrees, positive North, negative South); e.g., -17.533 for
     # Papeete, Tahiti. If LATIT is unknown, enter 45.0.
@@ -243,30 +259,30 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # <= 100 km (new input).
     # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
     # must be <= 100 km.
-    
-    ALTIT = ALTIT
-    HEIGHT = '0'
-    #LATIT = LATIT 
-    
+
+    ALTIT: str = ''
+    HEIGHT: str = ''
+    LATIT: str = ''
+
     ## Card 3: IATMOS is an option to select the proper default atmosphere
     # Its value can be either 0 or 1.
     # Set IATMOS = 0 to define a realistic (i.e., non-reference) atmosphere. Card 3a will then have to
     # provide TAIR, RH, SEASON, TDAY.
     # Set IATMOS = 1 to select one of 10 default reference atmospheres (i.e., for ideal conditions). The
     # shortened name of this atmosphere must be provided by ATMOS on Card 3a.
-    
-    IATMOS = '1'
-    
+
+    IATMOS: str = '1'
+
     # Card 3a (if IATMOS = 1): ATMOS
     # ATMOS is the name of the selected reference atmosphere; 4 characters max. This name can
-    # be one of the following: 
-    #    USSA   (U.S. Standard Atmosphere)   MLS   (Mid-Latitude Summer) 
-    #    MLW   (Mid-Latitude Winter)   SAS   (Sub-Arctic Summer) 
+    # be one of the following:
+    #    USSA   (U.S. Standard Atmosphere)   MLS   (Mid-Latitude Summer)
+    #    MLW   (Mid-Latitude Winter)   SAS   (Sub-Arctic Summer)
     #   SAW   (Sub-Arctic Winter)   TRL   (Tropical)   STS   (Sub-Tropical Summer)
     #   STW   (Sub-Tropical Winter)   AS   (Arctic Summer)   AW   (Arctic Winter)
-    
-    ATMOS = 'USSA'
-    
+
+    ATMOS: str = 'USSA'
+
     # Card 3a(if IATMOS = 0): TAIR, RH, SEASON, TDAY.
     # RH: Relative humidity at site level (%).
     # SEASON: Can be either `WINTER` or `SUMMER`, for calculation of precipitable water and
@@ -277,12 +293,12 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # TDAY: Average daily temperature at site level (°C). For a flying object (HEIGHT > 0), this
     # is a reference temperature for various calculations, therefore it is important to provide a
     # realistic value in this case in particular. Acceptable range: -120 < TDAY < 50.
-    
-    RH = ''
-    TAIR = ''
-    SEASON = ''
-    TDAY = ''
-    
+
+    RH: str = ''
+    TAIR: str = ''
+    SEASON: str = ''
+    TDAY: str = ''
+
     ## Card 4: IH2O is an option to select the correct water vapor data. All water vapor calculations involve
     # precipitable water, W. The following values of IH2O are possible:
     # 0, to input W on Card 4a
@@ -294,12 +310,12 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
     # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
     # have precedence over the defaults.
-    IH2O = '1'
-    
+    IH2O: str = '1'
+
     # Card 4a: (if IH2O = 0): W is precipitable water above the site altitude
     # in units of cm, or equivalently, g/cm2; it must be <= 12.
-    W = ''
-    
+    W: str = ''
+
     ## Card 5: IO3 is an option to select the appropriate ozone abundance input.
     # IO3 = 0 to input IALT and AbO3 on Card 5a
     # IO3 = 1 to use a default value for AbO3 according to the reference atmosphere selected by
@@ -307,20 +323,20 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
     # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
     # have precedence over the defaults.
-    
-    IO3 = '1'
-    
+
+    IO3: str = '1'
+
     # Card 5a (if IO3 = 0): IALT, AbO3
     # IALT is an option to select the appropriate ozone column altitude correction.
     # IALT = 0 bypasses the altitude correction, so that the value of AbO3 on
     # Card 5a is used as is. IALT = 1 should be rather used if a vertical
     # profile correction needs to be applied (in case of an elevated site when
-    # the value of AbO3 is known only at sea level). 
-    
-    IALT = ''
-    AbO3 = ''
-    
-    ## Card 6 IGAS is an option to define the correct conditions for gaseous absorption and atmospheric pollution. 
+    # the value of AbO3 is known only at sea level).
+
+    IALT: str = ''
+    AbO3: str = ''
+
+    ## Card 6 IGAS is an option to define the correct conditions for gaseous absorption and atmospheric pollution.
     # IGAS = 0 if ILOAD on Card 6a is to be read so that extra gaseous absorption calculations
     # (corresponding to the gas load in the lower troposphere due to pollution or absence thereof) can be
     # initiated;
@@ -329,9 +345,9 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
     # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
     # have precedence over the defaults.
-    
-    IGAS = '0'
-    
+
+    IGAS: str = '0'
+
     # Card 6a  (if IGAS = 0): ILOAD is an option for tropospheric pollution, only used if IGAS = 0.
     # For ILOAD = 0, Card 6b will be read with the concentrations of 10 pollutants.
     # ILOAD = 1 selects default PRISTINE ATMOSPHERIC conditions, leading to slightly
@@ -340,9 +356,9 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # Setting ILOAD to 2-4 will increase the concentration of the 10 pollutants to possibly
     # represent typical urban conditions: LIGHT POLLUTION (ILOAD = 2), MODERATE
     # POLLUTION (ILOAD = 3), and SEVERE POLLUTION (ILOAD = 4).
-    
-    ILOAD = '1'
-    
+
+    ILOAD: str = '1'
+
     # Card 6b (if IGAS = 0 and ILOAD = 0): ApCH2O, ApCH4, ApCO, ApHNO2,
     # ApHNO3, ApNO, ApNO2, ApNO3, ApO3, ApSO2
     # ApCH2O: Formaldehyde volumetric concentration in the assumed 1-km deep tropospheric
@@ -365,25 +381,25 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # layer (ppmv).
     # ApSO2: Sulfur dioxide volumetric concentration in the assumed 1-km deep tropospheric
     # pollution layer (ppmv).
-    
-    ApCH2O = ''
-    ApCH4 = ''
-    ApCO = ''
-    ApHNO2 = ''
-    ApHNO3 = ''
-    ApNO = ''
-    ApNO2 = ''
-    ApNO3 = ''
-    ApO3 = ''
-    ApSO2 =''
-    
+
+    ApCH2O: str = ''
+    ApCH4: str = ''
+    ApCO: str = ''
+    ApHNO2: str = ''
+    ApHNO3: str = ''
+    ApNO: str = ''
+    ApNO2: str = ''
+    ApNO3: str = ''
+    ApO3: str = ''
+    ApSO2: str = ''
+
     ## Card 7 qCO2 carbon dioxide columnar volumetric concentration (ppmv).
-    qCO2 = '0.0'
-    
-    # Card 7a ISPCTR 
+    qCO2: str = '0.0'
+
+    # Card 7a ISPCTR
     # is an option to select the proper extraterrestrial
     # spectrum. This option allows to choose one out of ten possible spectral
-    # files (``Spctrm_n.dat``, where n = 0-8 or n = U).  
+    # files (``Spctrm_n.dat``, where n = 0-8 or n = U).
     # -1  Spctrm_U.dat  N/A User User
     # 0  Spctrm_0.dat  N/A Gueymard, 2004 (synthetic) 1366.10
     # 1  Spctrm_1.dat  N/A Gueymard, unpublished (synthetic) 1367.00
@@ -394,25 +410,25 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # 6  Spctrm_6.dat  thkur MODTRAN, Thuillier/Kurucz 1376.23
     # 7  Spctrm_7.dat  MODTRAN2 Wehrli/WRC/WMO, 1985 1367.00
     # 8  Spctrm_8.dat  N/A ASTM E490, 2000 (synthetic) 1366.10
-    
-    ISPCTR ='0'
-    
+
+    ISPCTR: str = '0'
+
     ## Card 8: AEROS selects the aerosol model, with one of the following twelve possible choices:
     #  S&F_RURAL ,  S&F_URBAN ,  S&F_MARIT ,  S&F_TROPO , These four choices
     # refer respectively to the Rural, Urban, Maritime and Tropospheric aerosol
-    # models (Shettle and Fenn, 1979), which are humidity dependent and common with MODTRAN. 
+    # models (Shettle and Fenn, 1979), which are humidity dependent and common with MODTRAN.
     #  SRA_CONTL ,  SRA_URBAN ,  SRA_MARIT , These three choices refer
     # respectively to the Continental, Urban, and Maritime aerosol models of
-    # the IAMAP preliminary standard atmosphere (IAMAP, 1986). 
+    # the IAMAP preliminary standard atmosphere (IAMAP, 1986).
     #  B&D_C ,  B&D_C1 , These two choices refer respectively to the Braslau &
-    # Dave aerosol type C and C1, themselves based on Deirmendjian's Haze L model. 
+    # Dave aerosol type C and C1, themselves based on Deirmendjian's Haze L model.
     #  DESERT_MIN ,  DESERT_MAX  DESERT_MIN corresponds to background (normal)
     # conditions in desert areas, whereas DESERT_MAX corresponds to extremely
-    # turbid conditions (sandstorms).  
+    # turbid conditions (sandstorms).
     # 'USER' Card 8a is then necessary to input user-supplied aerosol information.
-    
-    AEROS = 'S&F_TROPO' 
-    # Card 8a: 
+
+    AEROS: str = 'S&F_TROPO'
+    # Card 8a:
     # if AEROS =  USER : ALPHA1, ALPHA2, OMEGL, GG These 4 variables must represent broadband average values only!
     # ALPHA1: Average value of Ångström's wavelength exponent  $\alpha$ for wavelengths < 500 nm
     # (generally between 0.0 and 2.6).
@@ -420,11 +436,11 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # (generally between 0.0 and 2.6).
     # OMEGL: Aerosol single scattering albedo (generally between 0.6 and 1.0).
     # GG: Aerosol asymmetry parameter (generally between 0.5 and 0.9).
-    ALPHA1 = ''
-    ALPHA2 = ''
-    OMEGL = ''
-    GG = ''
-    
+    ALPHA1: str = ''
+    ALPHA2: str = ''
+    OMEGL: str = ''
+    GG: str = ''
+
     ## Card 9: ITURB is an option to select the correct turbidity data input. The different options are:
     # 0, to read TAU5 on Card 9a
     # 1, to read BETA on Card 9a
@@ -432,30 +448,30 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # 3, to read RANGE on Card 9a
     # 4, to read VISI on Card 9a
     # 5, to read TAU550 on Card 9a (new option).
-    
-    ITURB = '0'
-    
+
+    ITURB: str = '0'
+
     #Card 9a Turbidity value
-    TAU5 = '0.00' #if ITURB == 0
-    BETA = '' #if ITURB == 1
-    BCHUEP = '' #if ITURB == 2
-    RANGE = '' #if ITURB == 3
-    VISI = '' #if ITURB == 4
-    TAU550 = '' #if ITURB == 5
-    
+    TAU5: str = '0.00'  #if ITURB == 0
+    BETA: str = ''  #if ITURB == 1
+    BCHUEP: str = ''  #if ITURB == 2
+    RANGE: str = ''  #if ITURB == 3
+    VISI: str = ''  #if ITURB == 4
+    TAU550: str = ''  #if ITURB == 5
+
     ## Card 10: Far Field Albedo for backscattering
-    IALBDX = _material_to_code(material)
-    
+    IALBDX: str = '38'
+
     # Card 10a:
-    RHOX = ''
+    RHOX: str = ''
                             # Zonal broadband Lambertian ground albedo (for backscattering calculations); must
                             # be between 0 and 1.
-                            
-    # Card 10b: ITILT is an option for tilted surface calculations. 
-    #Select ITILT= 0 for no such calculation, 
+
+    # Card 10b: ITILT is an option for tilted surface calculations.
+    #Select ITILT= 0 for no such calculation,
     #ITILT = 1 to initiate these calculations using information on Card 10c.
-    ITILT = '1'
-    
+    ITILT: str = '1'
+
     # Card 10c:
     # IALBDG is identical to IALBDX (see Card 10) except that it relates to the foreground local
     # albedo seen by a tilted surface. The list of options is identical to that of IALBDG and thus
@@ -464,20 +480,20 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # plane. Use -999 for a sun-tracking surface.
     # WAZIM: Surface azimuth (0 to 360 decimal deg.) counted clockwise from North; e.g., 270
     # deg. for a surface facing West. Use -999 for a sun-tracking surface.
-    
-    IALBDG = IALBDX 
-    TILT = '0.0'
-    WAZIM = '180.0'
-    
+
+    IALBDG: str = '38'
+    TILT: str = '0.0'
+    WAZIM: str = '180.0'
+
     # Card 10d:
     # RHOG: Local broadband Lambertian foreground albedo (for tilted plane calculations), Card
     # 10d (if IALBDG = -1); usually between 0.05 and 0.90.
-    RHOG = ''
-    
+    RHOG: str = ''
+
     ## Card 11: Spectral range for all Calculations
-    WLMN = min_wvl #Min wavelength
-    WLMX = max_wvl #Max wavelength
-    SUNCOR = '1.0' 
+    WLMN: str = '280'  #Min wavelength
+    WLMX: str = '4000'  #Max wavelength
+    SUNCOR: str = '1.0'
         #Correction factor for irradiance is a correction factor equal to the inverse squared actual radius vector, or true Sun-Earth
         # distance; e.g., SUNCOR = 1.024.
         # SUNCOR varies naturally between 0.966 and 1.034, adding 3.4% to the irradiance in January
@@ -487,60 +503,62 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
         # the average extraterrestrial irradiance (or solar constant, see SOLARC) is to be used, or to any
         # other number between 0.966 and 1.034 to correct it for distance if so desired.
 
-    SOLARC = '1367.0' #Solar constant
-    
-    
+    SOLARC: str = '1367.0'  #Solar constant
+
+
     ## Card 12: Output results selection:
     # IPRT is an option to select the results to be printed on Files 16 and 17. Only broadband results are
     # output (to File 16) if IPRT = 0. Spectral results are added to File 16,
     # and Card 12a is read, if IPRT = 1. Spectral results are rather printed to
     # File 17 (in a spreadsheet-like format) if IPRT = 2. Finally, spectral
-    # results are printed to both File 16 and 17 if IPRT = 3. Cards 
+    # results are printed to both File 16 and 17 if IPRT = 3. Cards
     # 12b and 12c are read if IPRT = 2 or 3 (see IOTOT and IOUT).
-    
-    IPRT = '2'
-    
+
+    IPRT: str = '2'
+
     # Card 12a: Min, Max and Step wavelength (nm) (Output can be different than
     # calculation...
-    WPMN = WLMN
-    WPMX = WLMX
-    INTVL = '.5'
-    
+    # With INTVL = 0.5 the results are printed on SMARTS' own grid (see
+    # _NATIVE_STEPS); larger steps interpolate it.
+    WPMN: str = '280'
+    WPMX: str = '4000'
+    INTVL: str = '.5'
+
     # Card 12b: Total number of output variables:
     #IOTOT = XXX #This is determined with the input of this function
-    
-    # Card 12c: Variables to output selection 
+
+    # Card 12c: Variables to output selection
     #(space separated numbers 1-43 according to the table below:
-    IOUT = IOUT
-    
-    
+    IOUT: str = ''
+
+
     ## Card 13: Circumsolar Calculation
     # ICIRC is an option controlling the calculation of circumsolar radiation, which is useful when
     # simulating any type of radiometer (spectral or broadband) equipped with a collimator.
     # ICIRC = 0 bypasses these calculations.
     # ICIRC = 1 indicates that a typical radiometer needs to be simulated. The geometry of its collimator
     # must then defined on Card 13a.
-    
-    ICIRC = '0'
-    
+
+    ICIRC: str = '0'
+
     #Card 13a (if ICIRC = 1): SLOPE, APERT, LIMIT
-    SLOPE = ''
-    APERT = ''
-    LIMIT = ''
-    
+    SLOPE: str = ''
+    APERT: str = ''
+    LIMIT: str = ''
+
     ## Card 14 Option for using the scanning/smoothing virtual filter of the postprocessor.
     # The smoothed results are output on a spreadsheet-ready file, File 18 (``smarts295.scn.txt``). This postprocessor is
     # activated if ISCAN = 1, not if ISCAN = 0. Card 14a is read if ISCAN = 1.
-    
-    ISCAN = '0'
-    
+
+    ISCAN: str = '0'
+
     # Card 14a (if ISCAN = 1): IFILT, WV1, WV2, STEP, FWHM
-    IFILT = ''
-    WV1 = ''
-    WV2 = ''
-    STEP = ''
-    FWHM = ''
-    
+    IFILT: str = ''
+    WV1: str = ''
+    WV2: str = ''
+    STEP: str = ''
+    FWHM: str = ''
+
     ## Card 15 ILLUM: Option for illuminance, luminous efficacy and photosynthetically active radiation (PAR)
     # calculations. These calculations take place if ILLUM = -1, 1, -2 or 2, and are bypassed if ILLUM = 0.
     # With ILLUM = -1 or 1, illuminance calculations are based on the CIE photopic curve (or Vlambda
@@ -551,18 +569,18 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # Moreover, if ILLUM = 1 or 2, luminous efficacy calculations are added to the illuminance
     # calculations. This overrides the values of WLMN and WLMX on Card 11, and replaces them by 280
     # and 4000, respectively.
-    
-    ILLUM = '0'
-    
-    ## Card  16: Option for special broadband UV calculations. Select IUV = 0 for no special UV calculation, 
+
+    ILLUM: str = '0'
+
+    ## Card  16: Option for special broadband UV calculations. Select IUV = 0 for no special UV calculation,
     # IUV = 1 to initiate such calculations. These include UVA, UVB, UV index, and
     # different action weighted irradiances of interest in photobiology.
     # Note that IUV = 1 overrides WLMN and WLMX so that calculations are done between at least 280
     # and 400 nm. The spectral results are also printed between at least 280 and 400 nm, irrespective of
     # the IPRT, WPMN, and WPMX values.
-    
-    IUV = '0'
-    
+
+    IUV: str = '0'
+
     ## Card 17:
     # Option for solar position and air mass calculations. Set IMASS to:
     # 0, if inputs are to be ZENIT, AZIM on Card 17a
@@ -570,50 +588,256 @@ def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, mat
     # 2, if input is to be AMASS on Card 17a
     # 3, if inputs are to be YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE on Card 17a
     # 4, if inputs are to be MONTH, LATIT, DSTEP on Card 17a (for a daily calculation).
-    IMASS = '3'
+    IMASS: str = '0'
+
 
-    
     # Card 17a: IMASS = 0 Zenith and azimuth
-    ZENITH = ''
-    AZIM = ''
-    
+    ZENITH: str = ''
+    AZIM: str = ''
+
     # Card 17a: IMASS = 1 Elevation and Azimuth
-    ELEV = ''
-    
+    ELEV: str = ''
+
     # Card 17a: IMASS = 2 Input air mass directly
-    AMASS = ''
-    
+    AMASS: str = ''
+
     # Card 17a: IMASS = 3 Input date, time and coordinates
-    YEAR = YEAR
-    MONTH = MONTH
-    DAY = DAY
-    HOUR = HOUR
-    LATIT = LATIT
-    LONGIT = LONGIT
-    ZONE = ZONE
-    
-    # Card 17a: IMASS = 4 Input Moth, Latitude and DSTEP
-    DSTEP = ''
+    YEAR: str = ''
+    MONTH: str = ''
+    DAY: str = ''
+    HOUR: str = ''
+    # LATIT is shared with Card 2a.
+    LONGIT: str = ''
+    ZONE: str = ''
 
-    output = _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, AZIM, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP, SMARTSPATH)
+    # Card 17a: IMASS = 4 Input Moth, Latitude and DSTEP
+    DSTEP: str = ''
 
-    return output
 
+_DEFAULT_CONFIG = SMARTSConfig()
 
-def SMARTSAirMass(IOUT, material='LiteSoil', AMASS = '1.0', min_wvl='280', max_wvl='4000', SMARTSPATH=None):
-    r'''
-    This function calculates the spectral albedo for a given material. If no 
-    material is provided, the function will return a list of all valid 
-    materials.
 
-    Parameters
-    ----------
-    material : string
-        Unique identifier for ground cover. Pass None to retreive a list of
-        all valid materials.
-    WLMN : string
-        Minimum wavelength to retreive
-    WLMX : string
+def IOUT_to_code(IOUT):
+    r''' Function to display the options of outputs that SMARTS has. 
+     If run without input (IOUT = None), it prints in a list all possible outputs.
+     If IOUT is passed to equal one of the outputs (i.e. 
+     (i.e. IOUT = 'Global horizontal irradiance W m-2'), it returns the
+     code number for that output (returns '4' for this example).
+     
+     PARAMETERS
+     -----------
+     IOUT: String
+           Can be None or a SMARTS output description
+          
+     RETURNS
+     -------
+     IOUT_Key: String
+          Key code to SMARTS cards input.
+
+     '''
+
+    IOUT_map = { 'Extraterrestrial spectrum W m-2':     '1', 
+            'Direct normal irradiance W m-2':     '2',
+            'Diffuse horizontal irradiance W m-2':     '3',
+            'Global horizontal irradiance W m-2':     '4',
+            'Direct horizontal irradiance W m-2':     '5',
+            'Direct tilted irradiance W m-2':     '6',
+            'Diffuse tilted irradiance W m-2':     '7',
+            'Global tilted irradiance W m-2':     '8',
+            'Experimental direct normal irradiance (with circumsolar) W m-2':     '9',
+            'Experimental diffuse horizontal irradiance W m-2':     '10',
+            'Circumsolar irradiance within radiometer field of view W m-2':     '11',
+            'Global tilted photon flux per wavelength cm-2 s-1 nm-1':     '12*',
+            'Direct normal photon flux per wavelength cm-2 s-1 nm-1':     '13',
+            'Diffuse horizontal photon flux per wavelength cm-2 s-1 nm-1':     '14',
+            'Rayleigh transmittance':     '15',
+            'Ozone transmittance':     '16',
+            'Transmittance from all trace gases':     '17',
+            'Water vapor transmittance':     '18',
+            'Mixed gas transmittance':     '19',
+            'Aerosol transmittance':     '20',
+            'Beam radiation transmittance':     '21',
+            'Rayleigh optical thickness':     '22',
+            'Ozone optical thickness':     '23',
+            'Optical thickness from all trace gases':     '24',
+            'Water vapor optical thickness':     '25',
+            'Mixed gas optical thickness':     '26',
+            'Aerosol optical thickness':     '27',
+            'Aerosol single scattering albedo':     '28',
+            'Aerosol asymmetry factor':     '29',
+            'Zonal surface reflectance':     '30',
+            'Local ground reflectance':     '31',
+            'Atmospheric reflectance':     '32',
+            'Global foreground reflected irradiance on tilted surface W m-2':     '33*',
+            'Upward hemispheric ground-reflected irradiance W m-2':     '34*',
+            'Global horizontal photosynthetic photon flux ?mol m-2 s-1 nm-1':     '35*',
+            'Direct normal photosynthetic photon flux ?mol m-2 s-1 nm-1':     '36*',
+            'Diffuse horizontal photosynthetic photon flux ?mol m-2 s-1 nm-1':     '37*',
+            'Global tilted photosynthetic photon flux ?mol m-2 s-1 nm-1':     '38*',
+            'Spectral photonic energy eV':     '39*',
+            'Global horizontal photon flux per eV cm-2 s-1 eV-1':     '40*',
+            'Direct normal photon flux per eV cm-2 s-1 eV-1':     '41*',
+            'Diffuse horizontal photon flux per eV cm-2 s-1 eV-1':     '42*',
+            'Global tilted photon flux per eV cm-2 s-1 eV-1':     '43*'
+            }
+    
+    if not IOUT:
+        return list(IOUT_map.keys())
+    try:
+        return IOUT_map[IOUT]
+    except KeyError:
+        warnings.warn(f"Unknown output specified: '{IOUT}'")
+        return None
+
+    
+# Comments include Description, File name(.DAT extension), Reflection, Type*, Spectral range(um), Category*
+# *KEYS: L Lambertian, NL Non-Lambertian, SP Specular, M Manmade materials, S Soils and rocks, U User defined, V Vegetation, W Water, snow, or ice
+_MATERIAL_CODES = { 'UsrLamb':     '0',  # User-defined spectral reflectance Albedo L Userdefined
+                   'UsrNLamb':    '1',  # User-defined spectral reflectance Albedo NL Userdefined
+                   'Water':       '2',  # Water or calm ocean (calculated) SP 0.28 4.0 W
+                   'Snow':        '3',  # Fresh dry snow Snow NL 0.3 2.48 W
+                   'Neve':        '4',  # Snow on a mountain neve Neve NL 0.45 1.65 W
+                   'Basalt':      '5',  # Basalt rock Basalt NL 0.3 2.48 S
+                   'Dry_sand':    '6',  # Dry sand Dry_sand NL 0.32 0.99 S
+                   'WiteSand':    '7',  # Sand from White Sands, NM WiteSand NL 0.5 2.48 S
+                   'Soil':        '8',  # Bare soil Soil NL 0.28 4.0 S
+                   'Dry_clay':    '9',  # Dry clay soil Dry_clay NL 0.5 2.48 S
+                   'Wet_clay':    '10', # Wet clay soil Wet_clay NL 0.5 2.48 S
+                   'Alfalfa':     '11', # Alfalfa Alfalfa NL 0.3 0.8 V
+                   'Grass':       '12', # Green grass Grass NL 0.3 1.19 V
+                   'RyeGrass':    '13', # Perennial rye grass RyeGrass NL 0.44 2.28 V
+                   'Meadow1':     '14', # Alpine meadow Meadow1 NL 0.4 0.85 V
+                   'Meadow2':     '15', # Lush meadow Meadow2 NL 0.4 0.9 V
+                   'Wheat':       '16', # Wheat crop Wheat NL 0.42 2.26 V
+                   'PineTree':    '17', # Ponderosa pine tree PineTree NL 0.34 2.48 V
+                   'Concrete':    '18', # Concrete slab Concrete NL 0.3 1.3 M
+                   'BlckLoam':    '19', # Black loam BlckLoam NL 0.4 4.0 S
+                   'BrwnLoam':    '20', # Brown loam BrwnLoam NL 0.4 4.0 S
+                   'BrwnSand':    '21', # Brown sand BrwnSand NL 0.4 4.0 S
+                   'Conifers':    '22', # Conifer trees Conifers NL 0.302 4.0 V
+                   'DarkLoam':    '23', # Dark loam DarkLoam NL 0.46-4.0 S
+                   'DarkSand':    '24', # Dark sand DarkSand NL 0.4 4.0 S
+                   'Decidous':    '25', # Decidous trees Decidous NL 0.302 4.0 V
+                   'DryGrass':    '26', # Dry grass (sod) DryGrass NL 0.38 4.0 V
+                   'DuneSand':    '27', # Dune sand DuneSand NL 0.4 4.0 S
+                   'FineSnow':    '28', # Fresh fine snow FineSnow NL 0.3 4.0 W
+                   'GrnGrass':    '29', # Green rye grass (sod) GrnGrass NL 0.302 4.0 V
+                   'GrnlSnow':    '30', # Granular snow GrnlSnow NL 0.3 4.0 W
+                   'LiteClay':    '31', # Light clay LiteClay NL 0.4 4.0 S
+                   'LiteLoam':    '32', # Light loam LiteLoam NL 0.431 4.0 S
+                   'LiteSand':    '33', # Light sand LiteSand NL 0.4 4.0 S
+                   'PaleLoam':    '34', # Pale loam PaleLoam NL 0.4 4.0 S
+                   'Seawater':    '35', # Sea water Seawater NL 2.079 4.0 W
+                   'SolidIce':    '36', # Solid ice SolidIce NL 0.3 4.0 W
+                   'Dry_Soil':    '37', # Dry soil Dry_Soil NL 0.28 4.0 S
+                   'LiteSoil':    '38', # Light soil LiteSoil NL 0.28 4.0 S
+                   'RConcrte':    '39', # Old runway concrete RConcrte NL 0.3 4.0 M
+                   'RoofTile':    '40', # Terracota roofing clay tile RoofTile NL 0.3 4.0 M
+                   'RedBrick':    '41', # Red construction brick RedBrick NL 0.3 4.0 M
+                   'Asphalt':     '42', # Old runway asphalt Asphalt NL 0.3 4.0 M
+                   'TallCorn':    '43', # Tall green corn TallCorn NL 0.36-1.0 V
+                   'SndGravl':    '44', # Sand & gravel SndGravl NL 0.45-1.04 S
+                   'Fallow':      '45', # Fallow field Fallow NL 0.32-1.19 S
+                   'Birch':       '46', # Birch leaves Birch NL 0.36-2.48 V
+                   'WetSoil':     '47', # Wet sandy soil WetSSoil NL 0.48-2.48 S
+                   'Gravel':      '48', # Gravel Gravel NL 0.32-1.3 S
+                   'WetClay2':    '49', # Wet red clay WetClay2 NL 0.52-2.48 S
+                   'WetSilt':     '50', # Wet silt WetSilt NL 0.52-2.48 S
+                   'LngGrass':    '51', # Dry long grass LngGrass NL 0.277-2.976 V
+                   'LwnGrass':    '52', # Lawn grass (generic bluegrass) LwnGrass NL 0.305-2.944 V
+                   'OakTree':     '53', # Deciduous oak tree leaves OakTree NL 0.35-2.5 V
+                   'Pinion':      '54', # Pinion pinetree needles Pinion NL 0.301-2.592 V
+                   'MeltSnow':    '55', # Melting snow (slush) MeltSnow NL 0.35-2.5 W
+                   'Plywood':     '56', # Plywood sheet (new, pine, 4-ply) Plywood NL 0.35-2.5 M
+                   'WiteVinl':    '57', # White vinyl plastic sheet, 0.15 mm WiteVinl NL 0.35-2.5 M
+                   'FibrGlss':    '58', # Clear fiberglass greenhouse roofing FibrGlss NL 0.35-2.5 M
+                   'ShtMetal':    '59', # Galvanized corrugated sheet metal, new ShtMetal NL 0.35-2.5 M
+                   'Wetland':     '60', # Wetland vegetation canopy, Yellowstone Wetland NL 0.409-2.478 V
+                   'SageBrsh':    '61', # Sagebrush canopy, Yellowstone SageBrsh NL 0.409-2.478 V
+                   'FirTrees':    '62', # Fir trees, Colorado FirTrees NL 0.353-2.592 V
+                   'CSeaWatr':    '63', # Coastal seawater, Pacific CSeaWatr NL 0.277-2.976 W
+                   'OSeaWatr':    '64', # Open ocean seawater, Atlantic OSeaWatr NL 0.277-2.976 W
+                   'GrazingField':'65', # Grazing field (unfertilized) GrazingField NL 0.401-2.499 V
+                   'Spruce':      '66'  # Young Norway spruce tree (needles) Spruce NL 0.39-0.845 V
+                 }
+
+
+def _material_to_code(material):
+    if not material:
+        return list(_MATERIAL_CODES)
+    code = _MATERIAL_CODES.get(material)
+    if code is None:
+        warnings.warn(f"Unknown material specified: '{material}'")
+    return code
+
+def _solar_position(YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE):
+    r''' Solar zenith and azimuth angles [deg] and Sun-Earth distance correction
+    (SUNCOR) from the NOAA general solar position equations. Works on scalars
+    or arrays. HOUR is local standard time of ZONE (hours from UTC, positive
+    East), as in SMARTS Card 17a. The zenith includes atmospheric refraction
+    (Saemundsson) for a sun above the horizon. The azimuth is counted
+    clockwise from North.
+    '''
+    YEAR, MONTH, DAY = (np.asarray(v, dtype=int) for v in (YEAR, MONTH, DAY))
+    HOUR, LATIT, LONGIT, ZONE = (np.asarray(v, dtype=float) for v in (HOUR, LATIT, LONGIT, ZONE))
+
+    jan1 = (YEAR - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+    date = (YEAR - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (MONTH - 1)
+    doy = (date.astype('datetime64[D]') + (DAY - 1) - jan1).astype(int) + 1
+    ndays = np.where((YEAR % 4 == 0) & ((YEAR % 100 != 0) | (YEAR % 400 == 0)), 366, 365)
+
+    # Fractional year [rad], equation of time [min] and declination [rad]
+    g = 2*np.pi/ndays*(doy - 1 + (HOUR - 12)/24)
+    eqtime = 229.18*(0.000075 + 0.001868*np.cos(g) - 0.032077*np.sin(g)
+                     - 0.014615*np.cos(2*g) - 0.040849*np.sin(2*g))
+    decl = (0.006918 - 0.399912*np.cos(g) + 0.070257*np.sin(g) - 0.006758*np.cos(2*g)
+            + 0.000907*np.sin(2*g) - 0.002697*np.cos(3*g) + 0.00148*np.sin(3*g))
+    suncor = (1.000110 + 0.034221*np.cos(g) + 0.001280*np.sin(g)
+              + 0.000719*np.cos(2*g) + 0.000077*np.sin(2*g))
+
+    # Hour angle from true solar time [min]
+    ha = np.radians((HOUR*60 + eqtime + 4*LONGIT - 60*ZONE)/4 - 180)
+    lat = np.radians(LATIT)
+    cosz = np.sin(lat)*np.sin(decl) + np.cos(lat)*np.cos(decl)*np.cos(ha)
+    zenith = np.degrees(np.arccos(np.clip(cosz, -1, 1)))
+    azimuth = (np.degrees(np.arctan2(np.sin(ha), np.cos(ha)*np.sin(lat) - np.tan(decl)*np.cos(lat))) + 180) % 360
+
+    elev = 90 - zenith
+    refraction = np.where(elev > -1, 1.02/np.tan(np.radians(elev + 10.3/(elev + 5.11)))/60, 0)
+    zenith = zenith - refraction
+
+    return zenith, azimuth, suncor
+
+
+def _material_config(IOUT, material, min_wvl, max_wvl, **cards):
+    r''' Cards shared by the runs over a single ground cover (SMARTSTimeLocation,
+    SMARTSAirMass and SMARTSSpectraZenAzm): the material reflectance, also
+    used for the tilted surface, and the wavelength range of the outputs.
+    Any other card is given as a keyword, i.e. the sun position.
+    '''
+    IALBDX = _material_to_code(material)
+
+    return _DEFAULT_CONFIG._replace(
+        IALBDX=IALBDX, IALBDG=IALBDX,           # Cards 10 and 10c
+        WLMN=min_wvl, WLMX=max_wvl,             # Card 11
+        WPMN=min_wvl, WPMX=max_wvl, IOUT=IOUT,  # Cards 12a-12c
+        **cards)
+
+
+def SMARTSTimeLocation(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, material='LiteSoil', min_wvl='280', max_wvl='4000', SMARTSPATH=None, precompute_sun=False):
+    r'''
+    This function calculates the spectral albedo for a given material. If no 
+    material is provided, the function will return a list of all valid 
+    materials.
+
+    Parameters
+    ----------
+    material : string
+        Unique identifier for ground cover. Pass None to retreive a list of
+        all valid materials.
+    WLMN : string
+        Minimum wavelength to retreive
+    WLMX : string
         Maximum wavelength to retreive
     YEAR : string
         Year
@@ -631,1283 +855,454 @@ def SMARTSAirMass(IOUT, material='LiteSoil', AMASS = '1.0', min_wvl='280', max_w
         elevation of the ground surface above sea level [km]
     ZONE : string
         Timezone
+    precompute_sun : bool
+        If True, the sun position and Sun-Earth distance correction are
+        calculated in Python and passed to SMARTS as zenith, azimuth and
+        SUNCOR (IMASS = 0), instead of letting SMARTS calculate them from the
+        date and location (IMASS = 3). Runs at different times with the same
+        sun position then share the result cache.
 
 
     Returns
     -------
     data : pandas
         Matrix with first column representing wavelength (in nm) and second
-        column representing albedo of specified material at the wavelength
+        column representing albedo of specified material at the wavelength.
+        Wavelengths are float64 and the outputs float32, which holds all the
+        digits SMARTS prints. Results are cached on the SMARTS inputs; clear them with
+        ``pySMARTS.clear_cache()``.
     
     Updates:
            6/20 Creation of second function to use zenith and azimuth M. Monarch
     '''
 
+    if not material:
+        return _material_to_code(material)
+
+    cfg = _material_config(IOUT, material, min_wvl, max_wvl,
+                           ISPR='1', ALTIT=ALTIT, HEIGHT='0')  # Card 2a: pressure from altitude
+
+    # Cards 17 and 17a
+    if precompute_sun:
+        zenith, azimuth, suncor = _solar_position(float(YEAR), float(MONTH), float(DAY), float(HOUR),
+                                                  float(LATIT), float(LONGIT), float(ZONE))
+        cfg = cfg._replace(SUNCOR='{:.5f}'.format(suncor), IMASS='0',
+                           ZENITH='{:.4f}'.format(zenith), AZIM='{:.4f}'.format(azimuth))
+    else:
+        cfg = cfg._replace(IMASS='3', YEAR=YEAR, MONTH=MONTH, DAY=DAY, HOUR=HOUR,
+                           LATIT=LATIT, LONGIT=LONGIT, ZONE=ZONE)
+
+    output = _smartsAll(cfg, SMARTSPATH)
+
+    return output
+
+
+def SMARTSTimeLocationBatch(IOUT, times, LATIT, LONGIT, ALTIT, ZONE, material='LiteSoil', min_wvl='280', max_wvl='4000', SMARTSPATH=None, precompute_sun=False, n_jobs=1):
+    r'''
+    Runs SMARTSTimeLocation for every row of a table of times, i.e. for an
+    hourly sweep at one location or a set of sites, and collects all the
+    spectra in a single DataFrame.
+
+    Parameters
+    ----------
+    IOUT : string
+        Outputs to retreive, as in SMARTSTimeLocation.
+    times : pandas DataFrame
+        One row per run, with columns YEAR, MONTH, DAY and HOUR. Columns
+        LATIT, LONGIT, ALTIT and/or ZONE, if present, give the location of
+        each run instead of the arguments below.
+    LATIT : string
+        Latitude of the location.
+    LONGIT : string
+        Longitude of the location.
+    ALTIT : string
+        elevation of the ground surface above sea level [km]
+    ZONE : string
+        Timezone
+    material : string
+        Unique identifier for ground cover.
+    min_wvl : string
+        Minimum wavelength to retreive
+    max_wvl : string
+        Maximum wavelength to retreive
+    precompute_sun : bool
+        If True, the sun positions for all times are calculated at once in
+        Python and passed to SMARTS, as in SMARTSTimeLocation.
+    n_jobs : int or None
+        Number of SMARTS runs executed at the same time. Each run is a
+        separate SMARTS process working in its own scratch folder. The
+        default of 1 runs them one after the other; None uses one per CPU.
+
+    Returns
+    -------
+    data : pandas
+        The SMARTSTimeLocation outputs stacked one after the other, with a
+        MultiIndex of (index of times, row of the spectrum). Runs that did
+        not return anything are left out; None if none of them did.
+    '''
+
+    if not material:
+        return _material_to_code(material)
+    import pandas as pd
+
+    site = {name: times[name] if name in times else [value]*len(times)
+            for name, value in (('LATIT', LATIT), ('LONGIT', LONGIT), ('ALTIT', ALTIT), ('ZONE', ZONE))}
+
+    if precompute_sun:
+        # Vectorized over all the times; SMARTS gets zenith/azimuth instead.
+        zenith, azimuth, suncor = _solar_position(times['YEAR'], times['MONTH'], times['DAY'], times['HOUR'],
+                                                  *(np.asarray(site[name], dtype=float) for name in ('LATIT', 'LONGIT', 'ZONE')))
+        cfg = _material_config(IOUT, material, min_wvl, max_wvl,
+                               ISPR='1', ALTIT=ALTIT, HEIGHT='0', IMASS='0')
+        jobs = [cfg._replace(ALTIT=str(alt), SUNCOR='{:.5f}'.format(c), ZENITH='{:.4f}'.format(z), AZIM='{:.4f}'.format(a))
+                for alt, z, a, c in zip(site['ALTIT'], zenith, azimuth, suncor)]
+        run = lambda cfg: _smartsAll(cfg, SMARTSPATH)
+    else:
+        jobs = list(zip(times['YEAR'], times['MONTH'], times['DAY'], times['HOUR'],
+                        site['LATIT'], site['LONGIT'], site['ALTIT'], site['ZONE']))
+        run = lambda t: SMARTSTimeLocation(IOUT, *map(str, t), material, min_wvl, max_wvl, SMARTSPATH)
+
+    results = dict(zip(times.index, _map_runs(run, jobs, n_jobs)))
+    results = {k: v for k, v in results.items() if v is not None}
+    if not results:
+        return None
+    return pd.concat(results)
+
+
+def SMARTSAirMass(IOUT, material='LiteSoil', AMASS = '1.0', min_wvl='280', max_wvl='4000', SMARTSPATH=None, raw=False):
+    r'''
+    This function calculates the spectral albedo for a given material. If no 
+    material is provided, the function will return a list of all valid 
+    materials.
+
+    Parameters
+    ----------
+    material : string
+        Unique identifier for ground cover. Pass None to retreive a list of
+        all valid materials.
+    WLMN : string
+        Minimum wavelength to retreive
+    WLMX : string
+        Maximum wavelength to retreive
+    YEAR : string
+        Year
+    MONTH : string
+        Month
+    DAY : string
+        Day
+    HOUR : string
+        Hour, in 24 hour format.
+    LATIT : string
+        Latitude of the location.
+    LONGIT : string
+        Longitude of the location.
+    ALTIT : string
+        elevation of the ground surface above sea level [km]
+    ZONE : string
+        Timezone
+    raw : bool
+        If True, return a SpectralBundle of float32 arrays instead of a
+        DataFrame.
+
+
+    Returns
+    -------
+    data : pandas
+        Matrix with first column representing wavelength (in nm) and second
+        column representing albedo of specified material at the wavelength.
+        Wavelengths are float64 and the outputs float32, which holds all the
+        digits SMARTS prints. Results are cached on the SMARTS inputs; clear them with
+        ``pySMARTS.clear_cache()``.
     
-    ## Card 1: Comment. 64 characters max. In theory no spaces but yes underscores.
-    CMNT = 'ASTMG173-03 (AM1.5 Standard)'
-    
-    ## Card 2: ISPR is an option for site's pressure.
-    # ISPR = 0 to input SPR on Card 2a
-    # ISPR = 1 to input SPR, ALTIT and HEIGHT on Card 2a
-    # ISPR = 2 to input LATIT, ALTIT and HEIGHT on Card 2a.
-    ISPR = '0'
-    
-    # Card 2a (if ISPR = 0): SPR
-    SPR = '1013.25' #mbar
-    
-    # Card 2a (if ISPR = 1): SPR, ALTIT, HEIGHT
-    # SPR: Surface pressure (mb).
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
+    Updates:
+           6/20 Creation of second function to use zenith and azimuth M. Monarch
+    '''
+
+    if not material:
+        return _material_to_code(material)
+
+
+    cfg = _material_config(IOUT, material, min_wvl, max_wvl,
+                           IGAS='1',                # Card 6: default gas abundances
+                           IMASS='2', AMASS=AMASS)  # Cards 17 and 17a
+
+    output = _smartsAll(cfg, SMARTSPATH)
+
+    if raw and output is not None:
+        return SpectralBundle.from_pandas(output)
+
+    return output
+
+
+def SMARTSAirMassMaterials(IOUT, materials, AMASS = '1.0', min_wvl='280', max_wvl='4000', SMARTSPATH=None, n_jobs=1):
+    r'''
+    Runs SMARTSAirMass for several materials at once, one SMARTS run per
+    material.
+
+    Parameters
+    ----------
+    IOUT : string
+        Outputs to retreive, as in SMARTSAirMass.
+    materials : list of strings
+        Unique identifiers for the ground covers.
+    AMASS : string
+        Air mass.
+    min_wvl : string
+        Minimum wavelength to retreive
+    max_wvl : string
+        Maximum wavelength to retreive
+    n_jobs : int or None
+        Number of SMARTS runs executed at the same time, as in
+        SMARTSTimeLocationBatch.
+
+    Returns
+    -------
+    data : dict
+        Dictionary of material: pandas DataFrame, each one formatted like the
+        output of SMARTSAirMass.
+    '''
+    materials = list(materials)
+    run = lambda material: SMARTSAirMass(IOUT, material, AMASS, min_wvl, max_wvl, SMARTSPATH)
+    return dict(zip(materials, _map_runs(run, materials, n_jobs)))
+
+
+def material_albedo(material, wavelengths=None, SMARTSPATH=None):
+    r'''
+    Spectral reflectance of a ground cover, read from its SMARTS
+    ``Albedo/*.DAT`` table without running SMARTS. This is the tabulated
+    reflectance SMARTS takes as input, interpolated here; it is not a SMARTS
+    output.
+
+    Parameters
+    ----------
+    material : string
+        Unique identifier for ground cover. Pass None to get a list of all
+        valid materials.
+    wavelengths : array
+        Wavelengths to return [nm]. Defaults to the 2002 wavelengths SMARTS
+        calculates on, from 280 to 4000 nm. The table is linearly interpolated, and held
+        constant beyond its first and last wavelength.
+
+    Returns
+    -------
+    data : pandas
+        Wavelengths (``Wvlgth``) and reflectance
+        (``Zonal_ground_reflectance``). None if the material has no
+        reflectance table (i.e. Water or user-defined materials).
+    '''
+    import pandas as pd
+
+    if not material:
+        return _material_to_code(material)
+    if _material_to_code(material) is None:
+        return None
+
+    smartsdir = _smarts_dir(SMARTSPATH)
+    table = os.path.join(smartsdir, 'Albedo', '{}.DAT'.format(material))
+    if not os.path.exists(table):
+        warnings.warn(f"No reflectance table for material '{material}' in {os.path.dirname(table)}")
+        return None
+
+    if wavelengths is None:
+        wavelengths = np.concatenate([np.arange(lo, hi, step) for lo, hi, step in _NATIVE_STEPS] +
+                                     [[_NATIVE_STEPS[-1][1]]])
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    wl, rho = _albedo_table(table, os.path.getmtime(table))
+    return pd.DataFrame({'Wvlgth': wavelengths,
+                         'Zonal_ground_reflectance': np.interp(wavelengths, wl, rho).astype(np.float32)})
+
+
+def SMARTSSpectraZenAzm(IOUT, ZENITH, AZIM, material='LiteSoil', SPR='1013.25', min_wvl='280', max_wvl='4000', SMARTSPATH=None):
+    r'''
+    This function calculates the spectral albedo for a given material. If no 
+    material is provided, the function will return a list of all valid 
+    materials.
+
+    Parameters
+    ----------
+    material : string
+        Unique identifier for ground cover. Pass None to retreive a list of
+        all valid materials.
+    WLMN : string
+        Minimum wavelength to retreive
+    WLMX : string
+        Maximum wavelength to retreive
+    ZENITH : string
+        Zenith angle of sun
+    AZIM : string
+        Azimuth of sun
+    SPR : string
+        Site Pressure [mbars]. Default: SPR = '1013.25'
+        
+        
+
+    Returns
+    -------
+    data : pandas
+        Matrix with first column representing wavelength (in nm) and second
+        column representing albedo of specified material at the wavelength.
+        Wavelengths are float64 and the outputs float32, which holds all the
+        digits SMARTS prints. Results are cached on the SMARTS inputs; clear them with
+        ``pySMARTS.clear_cache()``.
     
-    # Card 2a (if ISPR = 2): LATIT, ALTIT, HEIGHT
-    # LATIT: Site's latitude (decimal degrees, positive North, negative South); e.g., -17.533 for
-    # Papeete, Tahiti. If LATIT is unknown, enter 45.0.
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    ALTIT = ''
-    HEIGHT = ''
-    #LATIT = LATIT 
-    
-    ## Card 3: IATMOS is an option to select the proper default atmosphere
-    # Its value can be either 0 or 1.
-    # Set IATMOS = 0 to define a realistic (i.e., non-reference) atmosphere. Card 3a will then have to
-    # provide TAIR, RH, SEASON, TDAY.
-    # Set IATMOS = 1 to select one of 10 default reference atmospheres (i.e., for ideal conditions). The
-    # shortened name of this atmosphere must be provided by ATMOS on Card 3a.
-    
-    IATMOS = '1'
-    
-    # Card 3a (if IATMOS = 1): ATMOS
-    # ATMOS is the name of the selected reference atmosphere; 4 characters max. This name can
-    # be one of the following: 
-    #    USSA   (U.S. Standard Atmosphere)   MLS   (Mid-Latitude Summer) 
-    #    MLW   (Mid-Latitude Winter)   SAS   (Sub-Arctic Summer) 
-    #   SAW   (Sub-Arctic Winter)   TRL   (Tropical)   STS   (Sub-Tropical Summer)
-    #   STW   (Sub-Tropical Winter)   AS   (Arctic Summer)   AW   (Arctic Winter)
-    
-    ATMOS = 'USSA'
-    
-    # Card 3a(if IATMOS = 0): TAIR, RH, SEASON, TDAY.
-    # RH: Relative humidity at site level (%).
-    # SEASON: Can be either `WINTER` or `SUMMER`, for calculation of precipitable water and
-    # stratospheric temperature. If the true season is Fall, select WINTER. Select SUMMER if the
-    # true season is Spring. SEASON slightly affects the ozone effective temperature and the
-    # aerosol optical characteristics.
-    # TAIR: Atmospheric temperature at site level (°C). Acceptable range: -120 < TAIR < 50.
-    # TDAY: Average daily temperature at site level (°C). For a flying object (HEIGHT > 0), this
-    # is a reference temperature for various calculations, therefore it is important to provide a
-    # realistic value in this case in particular. Acceptable range: -120 < TDAY < 50.
-    
-    RH = ''
-    TAIR = ''
-    SEASON = ''
-    TDAY = ''
-    
-    ## Card 4: IH2O is an option to select the correct water vapor data. All water vapor calculations involve
-    # precipitable water, W. The following values of IH2O are possible:
-    # 0, to input W on Card 4a
-    # 1, if W is to be defaulted to a value prescribed by the selected reference atmosphere and the site
-    # altitude (thus if IATMOS = 1 on Card 3). If IATMOS != 1, USSA will be defaulted for this step.
-    # 2, if W is to be calculated by the program from TAIR and RH (thus if IATMOS = 0 on Card 3). This
-    # calculation is only approximate (particularly if HEIGHT > 0) and therefore this option is not
-    # recommended.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    IH2O = '1'
-    
-    # Card 4a: (if IH2O = 0): W is precipitable water above the site altitude
-    # in units of cm, or equivalently, g/cm2; it must be <= 12.
-    W = ''
-    
-    ## Card 5: IO3 is an option to select the appropriate ozone abundance input.
-    # IO3 = 0 to input IALT and AbO3 on Card 5a
-    # IO3 = 1 to use a default value for AbO3 according to the reference atmosphere selected by
-    # IATMOS. If IATMOS != 1, USSA will be defaulted for this calculation.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IO3 = '1'
-    
-    # Card 5a (if IO3 = 0): IALT, AbO3
-    # IALT is an option to select the appropriate ozone column altitude correction.
-    # IALT = 0 bypasses the altitude correction, so that the value of AbO3 on
-    # Card 5a is used as is. IALT = 1 should be rather used if a vertical
-    # profile correction needs to be applied (in case of an elevated site when
-    # the value of AbO3 is known only at sea level). 
-    
-    IALT = ''
-    AbO3 = ''
-    
-    ## Card 6 IGAS is an option to define the correct conditions for gaseous absorption and atmospheric pollution. 
-    # IGAS = 0 if ILOAD on Card 6a is to be read so that extra gaseous absorption calculations
-    # (corresponding to the gas load in the lower troposphere due to pollution or absence thereof) can be
-    # initiated;
-    # IGAS =1 if all gas abundances (except carbon dioxide, ozone and water vapor see Cards 4a, 5a,
-    # and 7) are to be defaulted, using average vertical profiles.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IGAS = '1'
-    
-    # Card 6a  (if IGAS = 0): ILOAD is an option for tropospheric pollution, only used if IGAS = 0.
-    # For ILOAD = 0, Card 6b will be read with the concentrations of 10 pollutants.
-    # ILOAD = 1 selects default PRISTINE ATMOSPHERIC conditions, leading to slightly
-    # reduced abundances of some gases compared to the initial default obtained with the selected
-    # reference atmosphere.
-    # Setting ILOAD to 2-4 will increase the concentration of the 10 pollutants to possibly
-    # represent typical urban conditions: LIGHT POLLUTION (ILOAD = 2), MODERATE
-    # POLLUTION (ILOAD = 3), and SEVERE POLLUTION (ILOAD = 4).
-    
-    ILOAD = '1'
-    
-    # Card 6b (if IGAS = 0 and ILOAD = 0): ApCH2O, ApCH4, ApCO, ApHNO2,
-    # ApHNO3, ApNO, ApNO2, ApNO3, ApO3, ApSO2
-    # ApCH2O: Formaldehyde volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApCH4: Methane volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApCO: Carbon monoxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv), Card 6b.
-    # ApHNO2: Nitrous acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApHNO3: Nitric acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO: Nitric oxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO2: Nitrogen dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO3: Nitrogen trioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApO3: Ozone volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApSO2: Sulfur dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    
-    ApCH2O = ''
-    ApCH4 = ''
-    ApCO = ''
-    ApHNO2 = ''
-    ApHNO3 = ''
-    ApNO = ''
-    ApNO2 = ''
-    ApNO3 = ''
-    ApO3 = ''
-    ApSO2 =''
-    
-    ## Card 7 qCO2 carbon dioxide columnar volumetric concentration (ppmv).
-    qCO2 = '0.0'
-    
-    # Card 7a ISPCTR 
-    # is an option to select the proper extraterrestrial
-    # spectrum. This option allows to choose one out of ten possible spectral
-    # files (``Spctrm_n.dat``, where n = 0-8 or n = U).  
-    # -1  Spctrm_U.dat  N/A User User
-    # 0  Spctrm_0.dat  N/A Gueymard, 2004 (synthetic) 1366.10
-    # 1  Spctrm_1.dat  N/A Gueymard, unpublished (synthetic) 1367.00
-    # 2  Spctrm_2.dat  cebchkur MODTRAN, Cebula/Chance/Kurucz 1362.12
-    # 3  Spctrm_3.dat  chkur MODTRAN, Chance/Kurucz 1359.75
-    # 4  Spctrm_4.dat  newkur MODTRAN, New Kurucz 1368.00
-    # 5  Spctrm_5.dat  oldkur MODTRAN, Old Kurucz 1373.16
-    # 6  Spctrm_6.dat  thkur MODTRAN, Thuillier/Kurucz 1376.23
-    # 7  Spctrm_7.dat  MODTRAN2 Wehrli/WRC/WMO, 1985 1367.00
-    # 8  Spctrm_8.dat  N/A ASTM E490, 2000 (synthetic) 1366.10
-    
-    ISPCTR ='0'
-    
-    ## Card 8: AEROS selects the aerosol model, with one of the following twelve possible choices:
-    #  S&F_RURAL ,  S&F_URBAN ,  S&F_MARIT ,  S&F_TROPO , These four choices
-    # refer respectively to the Rural, Urban, Maritime and Tropospheric aerosol
-    # models (Shettle and Fenn, 1979), which are humidity dependent and common with MODTRAN. 
-    #  SRA_CONTL ,  SRA_URBAN ,  SRA_MARIT , These three choices refer
-    # respectively to the Continental, Urban, and Maritime aerosol models of
-    # the IAMAP preliminary standard atmosphere (IAMAP, 1986). 
-    #  B&D_C ,  B&D_C1 , These two choices refer respectively to the Braslau &
-    # Dave aerosol type C and C1, themselves based on Deirmendjian's Haze L model. 
-    #  DESERT_MIN ,  DESERT_MAX  DESERT_MIN corresponds to background (normal)
-    # conditions in desert areas, whereas DESERT_MAX corresponds to extremely
-    # turbid conditions (sandstorms).  
-    # 'USER' Card 8a is then necessary to input user-supplied aerosol information.
-    
-    AEROS = 'S&F_TROPO' 
-    # Card 8a: 
-    # if AEROS =  USER : ALPHA1, ALPHA2, OMEGL, GG These 4 variables must represent broadband average values only!
-    # ALPHA1: Average value of Ångström's wavelength exponent  $\alpha$ for wavelengths < 500 nm
-    # (generally between 0.0 and 2.6).
-    # ALPHA2: Average value of Ångström's wavelength exponent  $\alpha$ for wavelengths >= 500 nm
-    # (generally between 0.0 and 2.6).
-    # OMEGL: Aerosol single scattering albedo (generally between 0.6 and 1.0).
-    # GG: Aerosol asymmetry parameter (generally between 0.5 and 0.9).
-    ALPHA1 = ''
-    ALPHA2 = ''
-    OMEGL = ''
-    GG = ''
-    
-    ## Card 9: ITURB is an option to select the correct turbidity data input. The different options are:
-    # 0, to read TAU5 on Card 9a
-    # 1, to read BETA on Card 9a
-    # 2, to read BCHUEP on Card 9a
-    # 3, to read RANGE on Card 9a
-    # 4, to read VISI on Card 9a
-    # 5, to read TAU550 on Card 9a (new option).
-    
-    ITURB = '0'
-    
-    #Card 9a Turbidity value
-    TAU5 = '0.00' #if ITURB == 0
-    BETA = '' #if ITURB == 1
-    BCHUEP = '' #if ITURB == 2
-    RANGE = '' #if ITURB == 3
-    VISI = '' #if ITURB == 4
-    TAU550 = '' #if ITURB == 5
-    
-    ## Card 10: Far Field Albedo for backscattering
-    IALBDX = _material_to_code(material)
-    
-    # Card 10a:
-    RHOX = ''
-                            # Zonal broadband Lambertian ground albedo (for backscattering calculations); must
-                            # be between 0 and 1.
-                            
-    # Card 10b: ITILT is an option for tilted surface calculations. 
-    #Select ITILT= 0 for no such calculation, 
-    #ITILT = 1 to initiate these calculations using information on Card 10c.
-    ITILT = '1'
-    
-    # Card 10c:
-    # IALBDG is identical to IALBDX (see Card 10) except that it relates to the foreground local
-    # albedo seen by a tilted surface. The list of options is identical to that of IALBDG and thus
-    # extends from 1 to 64 (new).
-    # TILT: Tilt angle of the receiving surface (0 to 90 decimal deg.); e.g. 90.0 for a vertical
-    # plane. Use -999 for a sun-tracking surface.
-    # WAZIM: Surface azimuth (0 to 360 decimal deg.) counted clockwise from North; e.g., 270
-    # deg. for a surface facing West. Use -999 for a sun-tracking surface.
-    
-    IALBDG = IALBDX 
-    TILT = '0.0'
-    WAZIM = '180.0'
-    
-    # Card 10d:
-    # RHOG: Local broadband Lambertian foreground albedo (for tilted plane calculations), Card
-    # 10d (if IALBDG = -1); usually between 0.05 and 0.90.
-    RHOG = ''
-    
-    ## Card 11: Spectral range for all Calculations
-    WLMN = min_wvl #Min wavelength
-    WLMX = max_wvl #Max wavelength
-    SUNCOR = '1.0' 
-        #Correction factor for irradiance is a correction factor equal to the inverse squared actual radius vector, or true Sun-Earth
-        # distance; e.g., SUNCOR = 1.024.
-        # SUNCOR varies naturally between 0.966 and 1.034, adding 3.4% to the irradiance in January
-        # and reducing it by 3.4% in July. It is calculated by the program if the solar position is calculated
-        # from date & time, i.e., if IMASS = 3 on Card 17, thus overwriting the input SUNCOR value on
-        # Card 11. If solar position is directly input instead (IMASS = 3), SUNCOR should be set to 1.0 if
-        # the average extraterrestrial irradiance (or solar constant, see SOLARC) is to be used, or to any
-        # other number between 0.966 and 1.034 to correct it for distance if so desired.
-
-    SOLARC = '1367.0' #Solar constant
-    
-    
-    ## Card 12: Output results selection:
-    # IPRT is an option to select the results to be printed on Files 16 and 17. Only broadband results are
-    # output (to File 16) if IPRT = 0. Spectral results are added to File 16,
-    # and Card 12a is read, if IPRT = 1. Spectral results are rather printed to
-    # File 17 (in a spreadsheet-like format) if IPRT = 2. Finally, spectral
-    # results are printed to both File 16 and 17 if IPRT = 3. Cards 
-    # 12b and 12c are read if IPRT = 2 or 3 (see IOTOT and IOUT).
-    
-    IPRT = '2'
-    
-    # Card 12a: Min, Max and Step wavelength (nm) (Output can be different than
-    # calculation...
-    WPMN = WLMN
-    WPMX = WLMX
-    INTVL = '.5'
-    
-    # Card 12b: Total number of output variables:
-    #IOTOT = XXX #This is determined with the input of this function
-    
-    # Card 12c: Variables to output selection 
-    #(space separated numbers 1-43 according to the table below:
-    IOUT = IOUT
-    
-    
-    ## Card 13: Circumsolar Calculation
-    # ICIRC is an option controlling the calculation of circumsolar radiation, which is useful when
-    # simulating any type of radiometer (spectral or broadband) equipped with a collimator.
-    # ICIRC = 0 bypasses these calculations.
-    # ICIRC = 1 indicates that a typical radiometer needs to be simulated. The geometry of its collimator
-    # must then defined on Card 13a.
-    
-    ICIRC = '0'
-    
-    #Card 13a (if ICIRC = 1): SLOPE, APERT, LIMIT
-    SLOPE = ''
-    APERT = ''
-    LIMIT = ''
-    
-    ## Card 14 Option for using the scanning/smoothing virtual filter of the postprocessor.
-    # The smoothed results are output on a spreadsheet-ready file, File 18 (``smarts295.scn.txt``). This postprocessor is
-    # activated if ISCAN = 1, not if ISCAN = 0. Card 14a is read if ISCAN = 1.
-    
-    ISCAN = '0'
-    
-    # Card 14a (if ISCAN = 1): IFILT, WV1, WV2, STEP, FWHM
-    IFILT = ''
-    WV1 = ''
-    WV2 = ''
-    STEP = ''
-    FWHM = ''
-    
-    ## Card 15 ILLUM: Option for illuminance, luminous efficacy and photosynthetically active radiation (PAR)
-    # calculations. These calculations take place if ILLUM = -1, 1, -2 or 2, and are bypassed if ILLUM = 0.
-    # With ILLUM = -1 or 1, illuminance calculations are based on the CIE photopic curve (or Vlambda
-    # curve) of 1924, as supplied in File ``VLambda.dat``. With ILLUM = -2 or 2, the same calculations are
-    # done but the revised CIE photopic curve of 1988 is rather used (from File ``VMLambda.dat``). Note
-    # that selecting ILLUM = 1 or -1 will override WLMN and WLMX (see Card 11) so that calculations
-    # are done between at least 360 and 830 nm.
-    # Moreover, if ILLUM = 1 or 2, luminous efficacy calculations are added to the illuminance
-    # calculations. This overrides the values of WLMN and WLMX on Card 11, and replaces them by 280
-    # and 4000, respectively.
-    
-    ILLUM = '0'
-    
-    ## Card  16: Option for special broadband UV calculations. Select IUV = 0 for no special UV calculation, 
-    # IUV = 1 to initiate such calculations. These include UVA, UVB, UV index, and
-    # different action weighted irradiances of interest in photobiology.
-    # Note that IUV = 1 overrides WLMN and WLMX so that calculations are done between at least 280
-    # and 400 nm. The spectral results are also printed between at least 280 and 400 nm, irrespective of
-    # the IPRT, WPMN, and WPMX values.
-    
-    IUV = '0'
-    
-    ## Card 17:
-    # Option for solar position and air mass calculations. Set IMASS to:
-    # 0, if inputs are to be ZENIT, AZIM on Card 17a
-    # 1, if inputs are to be ELEV, AZIM on Card 17a
-    # 2, if input is to be AMASS on Card 17a
-    # 3, if inputs are to be YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE on Card 17a
-    # 4, if inputs are to be MONTH, LATIT, DSTEP on Card 17a (for a daily calculation).
-    IMASS = '2'
-
-    
-    # Card 17a: IMASS = 0 Zenith and azimuth
-    ZENITH = ''
-    AZIM = ''
-    
-    # Card 17a: IMASS = 1 Elevation and Azimuth
-    ELEV = ''
-    
-    # Card 17a: IMASS = 2 Input air mass directly
-    AMASS = AMASS
-    
-    # Card 17a: IMASS = 3 Input date, time and coordinates
-    YEAR = ''
-    MONTH = ''
-    DAY = ''
-    HOUR = ''
-    LATIT = ''
-    LONGIT = ''
-    ZONE = ''
-    
-    # Card 17a: IMASS = 4 Input Moth, Latitude and DSTEP
-    DSTEP = ''
-
-    output = _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, AZIM, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP, SMARTSPATH)
-
-    return output
-
-
-def SMARTSSpectraZenAzm(IOUT, ZENITH, AZIM, material='LiteSoil', SPR='1013.25', min_wvl='280', max_wvl='4000', SMARTSPATH=None):
-    r'''
-    This function calculates the spectral albedo for a given material. If no 
-    material is provided, the function will return a list of all valid 
-    materials.
-
-    Parameters
-    ----------
-    material : string
-        Unique identifier for ground cover. Pass None to retreive a list of
-        all valid materials.
-    WLMN : string
-        Minimum wavelength to retreive
-    WLMX : string
-        Maximum wavelength to retreive
-    ZENITH : string
-        Zenith angle of sun
-    AZIM : string
-        Azimuth of sun
-    SPR : string
-        Site Pressure [mbars]. Default: SPR = '1013.25'
-        
-        
-
-    Returns
-    -------
-    data : pandas
-        Matrix with first column representing wavelength (in nm) and second
-        column representing albedo of specified material at the wavelength
-    
-    Updates:
-           6/20 Creation of second function to use zenith and azimuth M. Monarch
-    '''
-
-    ## Card 1: Comment. 64 characters max. In theory no spaces but yes underscores.
-    CMNT = 'ASTMG173-03 (AM1.5 Standard)'   
-    
-    ## Card 2: ISPR is an option for site's pressure.
-    # ISPR = 0 to input SPR on Card 2a
-    # ISPR = 1 to input SPR, ALTIT and HEIGHT on Card 2a
-    # ISPR = 2 to input LATIT, ALTIT and HEIGHT on Card 2a.
-    ISPR = '0'
-    
-    # Card 2a (if ISPR = 0): SPR
-    SPR = SPR #mbar
-    
-    # Card 2a (if ISPR = 1): SPR, ALTIT, HEIGHT
-    # SPR: Surface pressure (mb).
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    # Card 2a (if ISPR = 2): LATIT, ALTIT, HEIGHT
-    # LATIT: Site's latitude (decimal degrees, positive North, negative South); e.g., -17.533 for
-    # Papeete, Tahiti. If LATIT is unknown, enter 45.0.
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    ALTIT = '' 
-    HEIGHT = ''
-    #LATIT = LATIT
-    
-    ## Card 3: IATMOS is an option to select the proper default atmosphere
-    # Its value can be either 0 or 1.
-    # Set IATMOS = 0 to define a realistic (i.e., non-reference) atmosphere. Card 3a will then have to
-    # provide TAIR, RH, SEASON, TDAY.
-    # Set IATMOS = 1 to select one of 10 default reference atmospheres (i.e., for ideal conditions). The
-    # shortened name of this atmosphere must be provided by ATMOS on Card 3a.
-    
-    IATMOS = '1'
-    
-    # Card 3a (if IATMOS = 1): ATMOS
-    # ATMOS is the name of the selected reference atmosphere; 4 characters max. This name can
-    # be one of the following: 
-    #    USSA   (U.S. Standard Atmosphere)   MLS   (Mid-Latitude Summer) 
-    #    MLW   (Mid-Latitude Winter)   SAS   (Sub-Arctic Summer) 
-    #   SAW   (Sub-Arctic Winter)   TRL   (Tropical)   STS   (Sub-Tropical Summer)
-    #   STW   (Sub-Tropical Winter)   AS   (Arctic Summer)   AW   (Arctic Winter)
-    
-    ATMOS = 'USSA'
-    
-    # Card 3a(if IATMOS = 0): TAIR, RH, SEASON, TDAY.
-    # RH: Relative humidity at site level (%).
-    # SEASON: Can be either `WINTER` or `SUMMER`, for calculation of precipitable water and
-    # stratospheric temperature. If the true season is Fall, select WINTER. Select SUMMER if the
-    # true season is Spring. SEASON slightly affects the ozone effective temperature and the
-    # aerosol optical characteristics.
-    # TAIR: Atmospheric temperature at site level (°C). Acceptable range: -120 < TAIR < 50.
-    # TDAY: Average daily temperature at site level (°C). For a flying object (HEIGHT > 0), this
-    # is a reference temperature for various calculations, therefore it is important to provide a
-    # realistic value in this case in particular. Acceptable range: -120 < TDAY < 50.
-    
-    RH = ''
-    TAIR = ''
-    SEASON = ''
-    TDAY = ''
-    
-    ## Card 4: IH2O is an option to select the correct water vapor data. All water vapor calculations involve
-    # precipitable water, W. The following values of IH2O are possible:
-    # 0, to input W on Card 4a
-    # 1, if W is to be defaulted to a value prescribed by the selected reference atmosphere and the site
-    # altitude (thus if IATMOS = 1 on Card 3). If IATMOS != 1, USSA will be defaulted for this step.
-    # 2, if W is to be calculated by the program from TAIR and RH (thus if IATMOS = 0 on Card 3). This
-    # calculation is only approximate (particularly if HEIGHT > 0) and therefore this option is not
-    # recommended.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    IH2O = '1'
-    
-    # Card 4a: (if IH2O = 0): W is precipitable water above the site altitude
-    # in units of cm, or equivalently, g/cm2; it must be <= 12.
-    W = ''
-    
-    ## Card 5: IO3 is an option to select the appropriate ozone abundance input.
-    # IO3 = 0 to input IALT and AbO3 on Card 5a
-    # IO3 = 1 to use a default value for AbO3 according to the reference atmosphere selected by
-    # IATMOS. If IATMOS != 1, USSA will be defaulted for this calculation.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IO3 = '1'
-    
-    # Card 5a (if IO3 = 0): IALT, AbO3
-    # IALT is an option to select the appropriate ozone column altitude correction.
-    # IALT = 0 bypasses the altitude correction, so that the value of AbO3 on
-    # Card 5a is used as is. IALT = 1 should be rather used if a vertical
-    # profile correction needs to be applied (in case of an elevated site when
-    # the value of AbO3 is known only at sea level). 
-    
-    IALT = ''
-    AbO3 = ''
-    
-    ## Card 6 IGAS is an option to define the correct conditions for gaseous absorption and atmospheric pollution. 
-    # IGAS = 0 if ILOAD on Card 6a is to be read so that extra gaseous absorption calculations
-    # (corresponding to the gas load in the lower troposphere due to pollution or absence thereof) can be
-    # initiated;
-    # IGAS =1 if all gas abundances (except carbon dioxide, ozone and water vapor see Cards 4a, 5a,
-    # and 7) are to be defaulted, using average vertical profiles.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IGAS = '0'
-    
-    # Card 6a  (if IGAS = 0): ILOAD is an option for tropospheric pollution, only used if IGAS = 0.
-    # For ILOAD = 0, Card 6b will be read with the concentrations of 10 pollutants.
-    # ILOAD = 1 selects default PRISTINE ATMOSPHERIC conditions, leading to slightly
-    # reduced abundances of some gases compared to the initial default obtained with the selected
-    # reference atmosphere.
-    # Setting ILOAD to 2-4 will increase the concentration of the 10 pollutants to possibly
-    # represent typical urban conditions: LIGHT POLLUTION (ILOAD = 2), MODERATE
-    # POLLUTION (ILOAD = 3), and SEVERE POLLUTION (ILOAD = 4).
-    
-    ILOAD = '1'
-    
-    # Card 6b (if IGAS = 0 and ILOAD = 0): ApCH2O, ApCH4, ApCO, ApHNO2,
-    # ApHNO3, ApNO, ApNO2, ApNO3, ApO3, ApSO2
-    # ApCH2O: Formaldehyde volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApCH4: Methane volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApCO: Carbon monoxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv), Card 6b.
-    # ApHNO2: Nitrous acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApHNO3: Nitric acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO: Nitric oxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO2: Nitrogen dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO3: Nitrogen trioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApO3: Ozone volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApSO2: Sulfur dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    
-    ApCH2O = ''
-    ApCH4 = ''
-    ApCO = ''
-    ApHNO2 = ''
-    ApHNO3 = ''
-    ApNO = ''
-    ApNO2 = ''
-    ApNO3 = ''
-    ApO3 = ''
-    ApSO2 =''
-    
-    ## Card 7 qCO2 carbon dioxide columnar volumetric concentration (ppmv).
-    qCO2 = '0.0'
-    
-    # Card 7a ISPCTR 
-    # is an option to select the proper extraterrestrial
-    # spectrum. This option allows to choose one out of ten possible spectral
-    # files (``Spctrm_n.dat``, where n = 0-8 or n = U).  
-    # -1  Spctrm_U.dat  N/A User User
-    # 0  Spctrm_0.dat  N/A Gueymard, 2004 (synthetic) 1366.10
-    # 1  Spctrm_1.dat  N/A Gueymard, unpublished (synthetic) 1367.00
-    # 2  Spctrm_2.dat  cebchkur MODTRAN, Cebula/Chance/Kurucz 1362.12
-    # 3  Spctrm_3.dat  chkur MODTRAN, Chance/Kurucz 1359.75
-    # 4  Spctrm_4.dat  newkur MODTRAN, New Kurucz 1368.00
-    # 5  Spctrm_5.dat  oldkur MODTRAN, Old Kurucz 1373.16
-    # 6  Spctrm_6.dat  thkur MODTRAN, Thuillier/Kurucz 1376.23
-    # 7  Spctrm_7.dat  MODTRAN2 Wehrli/WRC/WMO, 1985 1367.00
-    # 8  Spctrm_8.dat  N/A ASTM E490, 2000 (synthetic) 1366.10
-    
-    ISPCTR ='0'
-    
-    ## Card 8: AEROS selects the aerosol model, with one of the following twelve possible choices:
-    #  S&F_RURAL ,  S&F_URBAN ,  S&F_MARIT ,  S&F_TROPO , These four choices
-    # refer respectively to the Rural, Urban, Maritime and Tropospheric aerosol
-    # models (Shettle and Fenn, 1979), which are humidity dependent and common with MODTRAN. 
-    #  SRA_CONTL ,  SRA_URBAN ,  SRA_MARIT , These three choices refer
-    # respectively to the Continental, Urban, and Maritime aerosol models of
-    # the IAMAP preliminary standard atmosphere (IAMAP, 1986). 
-    #  B&D_C ,  B&D_C1 , These two choices refer respectively to the Braslau &
-    # Dave aerosol type C and C1, themselves based on Deirmendjian s Haze L model. 
-    #  DESERT_MIN ,  DESERT_MAX  DESERT_MIN corresponds to background (normal)
-    # conditions in desert areas, whereas DESERT_MAX corresponds to extremely
-    # turbid conditions (sandstorms).  
-    # 'USER' Card 8a is then necessary to input user-supplied aerosol information.
-    
-    AEROS = 'S&F_TROPO' 
-    # Card 8a: 
-    # if AEROS =  USER : ALPHA1, ALPHA2, OMEGL, GG These 4 variables must represent broadband average values only!
-    # ALPHA1: Average value of Ångström`s wavelength exponent $\alpha$ for wavelengths < 500 nm
-    # (generally between 0.0 and 2.6).
-    # ALPHA2: Average value of Ångström`s wavelength exponent $\alpha$ for wavelengths >= 500 nm
-    # (generally between 0.0 and 2.6).
-    # OMEGL: Aerosol single scattering albedo (generally between 0.6 and 1.0).
-    # GG: Aerosol asymmetry parameter (generally between 0.5 and 0.9).
-    ALPHA1 = ''
-    ALPHA2 = ''
-    OMEGL = ''
-    GG = ''
-    
-    ## Card 9: ITURB is an option to select the correct turbidity data input. The different options are:
-    # 0, to read TAU5 on Card 9a
-    # 1, to read BETA on Card 9a
-    # 2, to read BCHUEP on Card 9a
-    # 3, to read RANGE on Card 9a
-    # 4, to read VISI on Card 9a
-    # 5, to read TAU550 on Card 9a (new option).
-    
-    ITURB = '0'
-    
-    #Card 9a Turbidity value
-    TAU5 = '0.00' #if ITURB == 0
-    BETA = '' #if ITURB == 1
-    BCHUEP = '' #if ITURB == 2
-    RANGE = '' #if ITURB == 3
-    VISI = '' #if ITURB == 4
-    TAU550 = '' #if ITURB == 5
-    
-    ## Card 10: Far Field Albedo for backscattering
-    IALBDX = _material_to_code(material)
-    
-    # Card 10a:
-    RHOX = ''
-                            # Zonal broadband Lambertian ground albedo (for backscattering calculations); must
-                            # be between 0 and 1.
-                            
-    # Card 10b: ITILT is an option for tilted surface calculations. 
-    #Select ITILT= 0 for no such calculation, 
-    #ITILT = 1 to initiate these calculations using information on Card 10c.
-    ITILT = '1'
-    
-    # Card 10c:
-    # IALBDG is identical to IALBDX (see Card 10) except that it relates to the foreground local
-    # albedo seen by a tilted surface. The list of options is identical to that of IALBDG and thus
-    # extends from 1 to 64 (new).
-    # TILT: Tilt angle of the receiving surface (0 to 90 decimal deg.); e.g. 90.0 for a vertical
-    # plane. Use -999 for a sun-tracking surface.
-    # WAZIM: Surface azimuth (0 to 360 decimal deg.) counted clockwise from North; e.g., 270
-    # deg. for a surface facing West. Use -999 for a sun-tracking surface.
-    
-    IALBDG = IALBDX 
-    TILT = '0.0'
-    WAZIM = '180.0'
-    
-    # Card 10d:
-    # RHOG: Local broadband Lambertian foreground albedo (for tilted plane calculations), Card
-    # 10d (if IALBDG = -1); usually between 0.05 and 0.90.
-    RHOG = ''
-    
-    ## Card 11: Spectral range for all Calculations
-    WLMN = min_wvl #Min wavelength
-    WLMX = max_wvl #Max wavelength
-    SUNCOR = '1.0' 
-        #Correction factor for irradiance is a correction factor equal to the inverse squared actual radius vector, or true Sun-Earth
-        # distance; e.g., SUNCOR = 1.024.
-        # SUNCOR varies naturally between 0.966 and 1.034, adding 3.4% to the irradiance in January
-        # and reducing it by 3.4% in July. It is calculated by the program if the solar position is calculated
-        # from date & time, i.e., if IMASS = 3 on Card 17, thus overwriting the input SUNCOR value on
-        # Card 11. If solar position is directly input instead (IMASS = 3), SUNCOR should be set to 1.0 if
-        # the average extraterrestrial irradiance (or solar constant, see SOLARC) is to be used, or to any
-        # other number between 0.966 and 1.034 to correct it for distance if so desired.
+    Updates:
+           6/20 Creation of second function to use zenith and azimuth M. Monarch
+    '''
 
-    SOLARC = '1367.0' #Solar constant
-    
-    
-    ## Card 12: Output results selection:
-    # IPRT is an option to select the results to be printed on Files 16 and 17. Only broadband results are
-    # output (to File 16) if IPRT = 0. Spectral results are added to File 16,
-    # and Card 12a is read, if IPRT = 1. Spectral results are rather printed to
-    # File 17 (in a spreadsheet-like format) if IPRT = 2. Finally, spectral
-    # results are printed to both File 16 and 17 if IPRT = 3. Cards 
-    # 12b and 12c are read if IPRT = 2 or 3 (see IOTOT and IOUT).
-    
-    IPRT = '2'
-    
-    # Card 12a: Min, Max and Step wavelength (nm) (Output can be different than
-    # calculation...
-    WPMN = WLMN
-    WPMX = WLMX
-    INTVL = '.5'
-    
-    # Card 12b: Total number of output variables:
-    #IOTOT = XXX #This is determined with the input of this function
-    
-    # Card 12c: Variables to output selection 
-    #(space separated numbers 1-43 according to the table below:
-    #IOUT = '30 31'
-    
-    
-    ## Card 13: Circumsolar Calculation
-    # ICIRC is an option controlling the calculation of circumsolar radiation, which is useful when
-    # simulating any type of radiometer (spectral or broadband) equipped with a collimator.
-    # ICIRC = 0 bypasses these calculations.
-    # ICIRC = 1 indicates that a typical radiometer needs to be simulated. The geometry of its collimator
-    # must then defined on Card 13a.
-    
-    ICIRC = '0'
-    
-    #Card 13a (if ICIRC = 1): SLOPE, APERT, LIMIT
-    SLOPE = ''
-    APERT = ''
-    LIMIT = ''
-    
-    ## Card 14 Option for using the scanning/smoothing virtual filter of the postprocessor.
-    # The smoothed results are output on a spreadsheet-ready file, File 18 (``smarts295.scn.txt``). This postprocessor is
-    # activated if ISCAN = 1, not if ISCAN = 0. Card 14a is read if ISCAN = 1.
-    
-    ISCAN = '0'
-    
-    # Card 14a (if ISCAN = 1): IFILT, WV1, WV2, STEP, FWHM
-    IFILT = ''
-    WV1 = ''
-    WV2 = ''
-    STEP = ''
-    FWHM = ''
-    
-    ## Card 15 ILLUM: Option for illuminance, luminous efficacy and photosynthetically active radiation (PAR)
-    # calculations. These calculations take place if ILLUM = -1, 1, -2 or 2, and are bypassed if ILLUM = 0.
-    # With ILLUM = -1 or 1, illuminance calculations are based on the CIE photopic curve (or Vlambda
-    # curve) of 1924, as supplied in File ``VLambda.dat``. With ILLUM = -2 or 2, the same calculations are
-    # done but the revised CIE photopic curve of 1988 is rather used (from File ``VMLambda.dat``). Note
-    # that selecting ILLUM = 1 or -1 will override WLMN and WLMX (see Card 11) so that calculations
-    # are done between at least 360 and 830 nm.
-    # Moreover, if ILLUM = 1 or 2, luminous efficacy calculations are added to the illuminance
-    # calculations. This overrides the values of WLMN and WLMX on Card 11, and replaces them by 280
-    # and 4000, respectively.
-    
-    ILLUM = '0'
-    
-    ## Card  16: Option for special broadband UV calculations. Select IUV = 0 for no special UV calculation, 
-    # IUV = 1 to initiate such calculations. These include UVA, UVB, UV index, and
-    # different action weighted irradiances of interest in photobiology.
-    # Note that IUV = 1 overrides WLMN and WLMX so that calculations are done between at least 280
-    # and 400 nm. The spectral results are also printed between at least 280 and 400 nm, irrespective of
-    # the IPRT, WPMN, and WPMX values.
-    
-    IUV = '0'
-    
-    ## Card 17:
-    # Option for solar position and air mass calculations. Set IMASS to:
-    # 0, if inputs are to be ZENIT, AZIM on Card 17a
-    # 1, if inputs are to be ELEV, AZIM on Card 17a
-    # 2, if input is to be AMASS on Card 17a
-    # 3, if inputs are to be YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE on Card 17a
-    # 4, if inputs are to be MONTH, LATIT, DSTEP on Card 17a (for a daily calculation).
-    IMASS = '0'
+    if not material:
+        return _material_to_code(material)
 
-    
-    # Card 17a: IMASS = 0 Zenith and azimuth
-    #ZENITH = ''
-    #AZIM = ''
-    
-    # Card 17a: IMASS = 1 Elevation and Azimuth
-    ELEV = ''
-    
-    # Card 17a: IMASS = 2 Input air mass directly
-    AMASS = ''
-    
-    # Card 17a: IMASS = 3 Input date, time and coordinates
-    YEAR = ''
-    MONTH = ''
-    DAY = ''
-    HOUR = ''
-    LATIT = ''
-    LONGIT = ''
-    ZONE = ''
-    
-    # Card 17a: IMASS = 4 Input Moth, Latitude and DSTEP
-    DSTEP = ''
+    cfg = _material_config(IOUT, material, min_wvl, max_wvl,
+                           SPR=SPR,                              # Card 2a
+                           IMASS='0', ZENITH=ZENITH, AZIM=AZIM)  # Cards 17 and 17a
 
-    output = _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, AZIM, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP, SMARTSPATH)
+    output = _smartsAll(cfg, SMARTSPATH)
 
     return output
 
 
 
-def SMARTSTMY3(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, RHOG,
-               W, RH, TAIR, SEASON, TDAY, SPR, HEIGHT='0',
-               material='DryGrass', min_wvl='280', max_wvl='4000', SMARTSPATH=None):
-
+def SMARTSSpectraZenAzmLUT(IOUT, zeniths, azimuths, material='LiteSoil', SPR='1013.25', min_wvl='280', max_wvl='4000', SMARTSPATH=None, n_jobs=1):
     r'''
-    This function calculates the spectral albedo for a given material. If no 
-    material is provided, the function will return a list of all valid 
-    materials.
+    Runs SMARTSSpectraZenAzm on every combination of a grid of zeniths and
+    azimuths and returns the results as a lookup table, so spectra for many
+    sun positions with the same atmosphere can be interpolated instead of
+    running SMARTS for each one.
 
     Parameters
     ----------
+    IOUT : string
+        Outputs to retreive, as in SMARTSSpectraZenAzm.
+    zeniths : array
+        Ascending zenith angles of the sun [deg], at least two.
+    azimuths : array
+        Ascending azimuths of the sun [deg], at least two.
     material : string
-        Unique identifier for ground cover. Pass None to retreive a list of
-        all valid materials.
-    WLMN : string
+        Unique identifier for ground cover.
+    SPR : string
+        Site Pressure [mbars]. Default: SPR = '1013.25'
+    min_wvl : string
         Minimum wavelength to retreive
-    WLMX : string
+    max_wvl : string
         Maximum wavelength to retreive
-    YEAR : string
-        Year
-    MONTH : string
-        Month
-    DAY : string
-        Day
-    HOUR : string
-        Hour, in 24 hour format.
-    LATIT : string
-        Latitude of the location.
-    LONGIT : string
-        Longitude of the location.
-    ALTIT : string
-        elevation of the ground surface above sea level [km].
-        WARNING: Please note that TMY3 data is in meters, convert before using this
-        function.
-    ZONE : string
-        Timezone
-    RHOG : string
-        Local broadband Lambertian foreground albedo (for tilted plane calculations)
-    W : string
-        Precipitable water above the site altitude, in units of cm or equivalently
-        g/cm2/
-    RH : string
-        Relative Humidity
-    TAIR : string
-        Temperature.
-    SEASON : string
-        Season, either 'WINTER' or 'SUMMER'. If Spring, use 'SUMMER'. If
-        Autumn, use 'WINTER'.
-    TDAY : string
-        Average of the day's temperature.        
-    HEIGHT : string
-        Altitude of the simulated object over the surface, in km.
-    SPR : string
-        Site pressure, in mbars.
-        
-    Returns
-    -------
-    data : pandas
-        Matrix with first column representing wavelength (in nm) and second
-        column representing albedo of specified material at the wavelength
-    
-    '''
+    n_jobs : int or None
+        Number of SMARTS runs executed at the same time, as in
+        SMARTSTimeLocationBatch.
 
-    if float(ALTIT) > 800:
-        print("Altitude should be in km. Are you in Mt. Everest or above or",
-              "using meters? This might fail but we'll attempt to continue.")
-    
-    ## Card 1: Comment. 64 characters max. In theory no spaces but yes underscores.
-    CMNT = 'TMY Parameters Spectra'
-    
-    ## Card 2: ISPR is an option for site's pressure.
-    # ISPR = 0 to input SPR on Card 2a
-    # ISPR = 1 to input SPR, ALTIT and HEIGHT on Card 2a
-    # ISPR = 2 to input LATIT, ALTIT and HEIGHT on Card 2a.
-    ISPR = '1'
-    
-    # Card 2a (if ISPR = 0): SPR
-    SPR = SPR #mbar
-    
-    # Card 2a (if ISPR = 1): SPR, ALTIT, HEIGHT
-    # SPR: Surface pressure (mb).
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    # Card 2a (if ISPR = 2): LATIT, ALTIT, HEIGHT
-    # LATIT: Site's latitude (decimal degrees, positive North, negative South); e.g., -17.533 for
-    # Papeete, Tahiti. If LATIT is unknown, enter 45.0.
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    ALTIT = ALTIT
-    HEIGHT = HEIGHT
-    #LATIT = LATIT 
+    Returns
+    -------
+    lut : SpectralLUT
+        Call it as ``lut(zenith, azimuth)`` to get interpolated values. None
+        if any of the SMARTS runs failed.
+    '''
+    zeniths = np.asarray(zeniths, dtype=float)
+    azimuths = np.asarray(azimuths, dtype=float)
+    jobs = [(z, a) for z in zeniths for a in azimuths]
+    run = lambda job: SMARTSSpectraZenAzm(IOUT, str(job[0]), str(job[1]), material, SPR,
+                                          min_wvl, max_wvl, SMARTSPATH)
+    outputs = _map_runs(run, jobs, n_jobs)
+    if any(output is None for output in outputs):
+        return None
 
-    ## Card 3: IATMOS is an option to select the proper default atmosphere
-    # Its value can be either 0 or 1.
-    # Set IATMOS = 0 to define a realistic (i.e., non-reference) atmosphere. Card 3a will then have to
-    # provide TAIR, RH, SEASON, TDAY.
-    # Set IATMOS = 1 to select one of 10 default reference atmospheres (i.e., for ideal conditions). The
-    # shortened name of this atmosphere must be provided by ATMOS on Card 3a.
-    
-    IATMOS = '0'
-    
-    # Card 3a (if IATMOS = 1): ATMOS
-    # ATMOS is the name of the selected reference atmosphere; 4 characters max. This name can
-    # be one of the following: 
-    #    USSA   (U.S. Standard Atmosphere)   MLS   (Mid-Latitude Summer) 
-    #    MLW   (Mid-Latitude Winter)   SAS   (Sub-Arctic Summer) 
-    #   SAW   (Sub-Arctic Winter)   TRL   (Tropical)   STS   (Sub-Tropical Summer)
-    #   STW   (Sub-Tropical Winter)   AS   (Arctic Summer)   AW   (Arctic Winter)
-    
-    ATMOS = 'USSA'
-    
-    # Card 3a(if IATMOS = 0): TAIR, RH, SEASON, TDAY.
-    # RH: Relative humidity at site level (%).
-    # SEASON: Can be either `WINTER` or `SUMMER`, for calculation of precipitable water and
-    # stratospheric temperature. If the true season is Fall, select WINTER. Select SUMMER if the
-    # true season is Spring. SEASON slightly affects the ozone effective temperature and the
-    # aerosol optical characteristics.
-    # TAIR: Atmospheric temperature at site level (°C). Acceptable range: -120 < TAIR < 50.
-    # TDAY: Average daily temperature at site level (°C). For a flying object (HEIGHT > 0), this
-    # is a reference temperature for various calculations, therefore it is important to provide a
-    # realistic value in this case in particular. Acceptable range: -120 < TDAY < 50.
-    
-    RH = RH
-    TAIR = TAIR
-    SEASON = SEASON
-    TDAY = TDAY
-    
-    ## Card 4: IH2O is an option to select the correct water vapor data. All water vapor calculations involve
-    # precipitable water, W. The following values of IH2O are possible:
-    # 0, to input W on Card 4a
-    # 1, if W is to be defaulted to a value prescribed by the selected reference atmosphere and the site
-    # altitude (thus if IATMOS = 1 on Card 3). If IATMOS != 1, USSA will be defaulted for this step.
-    # 2, if W is to be calculated by the program from TAIR and RH (thus if IATMOS = 0 on Card 3). This
-    # calculation is only approximate (particularly if HEIGHT > 0) and therefore this option is not
-    # recommended.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IH2O = '0'
-    
-    # Card 4a: (if IH2O = 0): W is precipitable water above the site altitude
-    # in units of cm, or equivalently, g/cm2; it must be <= 12.
-    
-    W = W
-    
-    if float(W) == 0 or float(W) > 12:
-        print("Switching to calculating W")
-        IH2O = '2'
-        
-    
-    ## Card 5: IO3 is an option to select the appropriate ozone abundance input.
-    # IO3 = 0 to input IALT and AbO3 on Card 5a
-    # IO3 = 1 to use a default value for AbO3 according to the reference atmosphere selected by
-    # IATMOS. If IATMOS != 1, USSA will be defaulted for this calculation.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    IO3 = '1'
+    first = SpectralBundle.from_pandas(outputs[0])
+    values = np.stack([SpectralBundle.from_pandas(output).values for output in outputs])
+    return SpectralLUT(zeniths, azimuths, first.wl,
+                       values.reshape(len(zeniths), len(azimuths), *first.values.shape), first.names)
 
-    # Card 5a (if IO3 = 0): IALT, AbO3
-    # IALT is an option to select the appropriate ozone column altitude correction.
-    # IALT = 0 bypasses the altitude correction, so that the value of AbO3 on
-    # Card 5a is used as is. IALT = 1 should be rather used if a vertical
-    # profile correction needs to be applied (in case of an elevated site when
-    # the value of AbO3 is known only at sea level). 
-    
-    IALT = ''
-    AbO3 = ''
-    
-    ## Card 6 IGAS is an option to define the correct conditions for gaseous absorption and atmospheric pollution. 
-    # IGAS = 0 if ILOAD on Card 6a is to be read so that extra gaseous absorption calculations
-    # (corresponding to the gas load in the lower troposphere due to pollution or absence thereof) can be
-    # initiated;
-    # IGAS =1 if all gas abundances (except carbon dioxide, ozone and water vapor see Cards 4a, 5a,
-    # and 7) are to be defaulted, using average vertical profiles.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IGAS = '0'
-    
-    # Card 6a  (if IGAS = 0): ILOAD is an option for tropospheric pollution, only used if IGAS = 0.
-    # For ILOAD = 0, Card 6b will be read with the concentrations of 10 pollutants.
-    # ILOAD = 1 selects default PRISTINE ATMOSPHERIC conditions, leading to slightly
-    # reduced abundances of some gases compared to the initial default obtained with the selected
-    # reference atmosphere.
-    # Setting ILOAD to 2-4 will increase the concentration of the 10 pollutants to possibly
-    # represent typical urban conditions: LIGHT POLLUTION (ILOAD = 2), MODERATE
-    # POLLUTION (ILOAD = 3), and SEVERE POLLUTION (ILOAD = 4).
-    
-    ILOAD = '1'
-    
-    # Card 6b (if IGAS = 0 and ILOAD = 0): ApCH2O, ApCH4, ApCO, ApHNO2,
-    # ApHNO3, ApNO, ApNO2, ApNO3, ApO3, ApSO2
-    # ApCH2O: Formaldehyde volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApCH4: Methane volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApCO: Carbon monoxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv), Card 6b.
-    # ApHNO2: Nitrous acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApHNO3: Nitric acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO: Nitric oxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO2: Nitrogen dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO3: Nitrogen trioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApO3: Ozone volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApSO2: Sulfur dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    
-    ApCH2O = ''
-    ApCH4 = ''
-    ApCO = ''
-    ApHNO2 = ''
-    ApHNO3 = ''
-    ApNO = ''
-    ApNO2 = ''
-    ApNO3 = ''
-    ApO3 = ''
-    ApSO2 =''
-    
-    ## Card 7 qCO2 carbon dioxide columnar volumetric concentration (ppmv).
-    qCO2 = '0.0'
-    
-    # Card 7a ISPCTR 
-    # is an option to select the proper extraterrestrial
-    # spectrum. This option allows to choose one out of ten possible spectral
-    # files (``Spctrm_n.dat``, where n = 0-8 or n = U).
-    # -1  Spctrm_U.dat  N/A User User
-    # 0  Spctrm_0.dat  N/A Gueymard, 2004 (synthetic) 1366.10
-    # 1  Spctrm_1.dat  N/A Gueymard, unpublished (synthetic) 1367.00
-    # 2  Spctrm_2.dat  cebchkur MODTRAN, Cebula/Chance/Kurucz 1362.12
-    # 3  Spctrm_3.dat  chkur MODTRAN, Chance/Kurucz 1359.75
-    # 4  Spctrm_4.dat  newkur MODTRAN, New Kurucz 1368.00
-    # 5  Spctrm_5.dat  oldkur MODTRAN, Old Kurucz 1373.16
-    # 6  Spctrm_6.dat  thkur MODTRAN, Thuillier/Kurucz 1376.23
-    # 7  Spctrm_7.dat  MODTRAN2 Wehrli/WRC/WMO, 1985 1367.00
-    # 8  Spctrm_8.dat  N/A ASTM E490, 2000 (synthetic) 1366.10
-    
-    ISPCTR ='0'
-    
-    ## Card 8: AEROS selects the aerosol model, with one of the following twelve possible choices:
-    #  S&F_RURAL ,  S&F_URBAN ,  S&F_MARIT ,  S&F_TROPO , These four choices
-    # refer respectively to the Rural, Urban, Maritime and Tropospheric aerosol
-    # models (Shettle and Fenn, 1979), which are humidity dependent and common with MODTRAN. 
-    #  SRA_CONTL ,  SRA_URBAN ,  SRA_MARIT , These three choices refer
-    # respectively to the Continental, Urban, and Maritime aerosol models of
-    # the IAMAP preliminary standard atmosphere (IAMAP, 1986). 
-    #  B&D_C ,  B&D_C1 , These two choices refer respectively to the Braslau &
-    # Dave aerosol type C and C1, themselves based on Deirmendjian's Haze L model. 
-    #  DESERT_MIN ,  DESERT_MAX  DESERT_MIN corresponds to background (normal)
-    # conditions in desert areas, whereas DESERT_MAX corresponds to extremely
-    # turbid conditions (sandstorms).  
-    # 'USER' Card 8a is then necessary to input user-supplied aerosol information.
-    
-    AEROS = 'S&F_TROPO' 
-    # Card 8a: 
-    # if AEROS =  USER : ALPHA1, ALPHA2, OMEGL, GG These 4 variables must represent broadband average values only!
-    # ALPHA1: Average value of Ångström's wavelength exponent $\alpha$ for wavelengths < 500 nm
-    # (generally between 0.0 and 2.6).
-    # ALPHA2: Average value of Ångström's wavelength exponent $\alpha$ for wavelengths >= 500 nm
-    # (generally between 0.0 and 2.6).
-    # OMEGL: Aerosol single scattering albedo (generally between 0.6 and 1.0).
-    # GG: Aerosol asymmetry parameter (generally between 0.5 and 0.9).
-    ALPHA1 = ''
-    ALPHA2 = ''
-    OMEGL = ''
-    GG = ''
-    
-    ## Card 9: ITURB is an option to select the correct turbidity data input. The different options are:
-    # 0, to read TAU5 on Card 9a
-    # 1, to read BETA on Card 9a
-    # 2, to read BCHUEP on Card 9a
-    # 3, to read RANGE on Card 9a
-    # 4, to read VISI on Card 9a
-    # 5, to read TAU550 on Card 9a (new option).
-    
-    ITURB = '0'
-    
-    #Card 9a Turbidity value
-    TAU5 = '0.00' #if ITURB == 0
-    BETA = '' #if ITURB == 1
-    BCHUEP = '' #if ITURB == 2
-    RANGE = '' #if ITURB == 3
-    VISI = '' #if ITURB == 4
-    TAU550 = '' #if ITURB == 5
-    
-    ## Card 10: Far Field Albedo for backscattering
-    IALBDX = _material_to_code(material)
-    
-    # Card 10a:
-    RHOX = ''
-                            # Zonal broadband Lambertian ground albedo (for backscattering calculations); must
-                            # be between 0 and 1.
-                            
-    # Card 10b: ITILT is an option for tilted surface calculations. 
-    #Select ITILT= 0 for no such calculation, 
-    #ITILT = 1 to initiate these calculations using information on Card 10c.
-    ITILT = '1'
-    
-    # Card 10c:
-    # IALBDG is identical to IALBDX (see Card 10) except that it relates to the foreground local
-    # albedo seen by a tilted surface. The list of options is identical to that of IALBDG and thus
-    # extends from 1 to 64 (new).
-    # TILT: Tilt angle of the receiving surface (0 to 90 decimal deg.); e.g. 90.0 for a vertical
-    # plane. Use -999 for a sun-tracking surface.
-    # WAZIM: Surface azimuth (0 to 360 decimal deg.) counted clockwise from North; e.g., 270
-    # deg. for a surface facing West. Use -999 for a sun-tracking surface.
-    
-    IALBDG = '-1' #Sil check if this should be -1 or 1.
-    TILT = '0.0'
-    WAZIM = '180.0'
-    
-    # Card 10d:
-    # RHOG: Local broadband Lambertian foreground albedo (for tilted plane calculations), Card
-    # 10d (if IALBDG = -1); usually between 0.05 and 0.90.
-    RHOG = RHOG
-    
-    ## Card 11: Spectral range for all Calculations
-    WLMN = min_wvl #Min wavelength
-    WLMX = max_wvl #Max wavelength
-    SUNCOR = '1.0' 
-        #Correction factor for irradiance is a correction factor equal to the inverse squared actual radius vector, or true Sun-Earth
-        # distance; e.g., SUNCOR = 1.024.
-        # SUNCOR varies naturally between 0.966 and 1.034, adding 3.4% to the irradiance in January
-        # and reducing it by 3.4% in July. It is calculated by the program if the solar position is calculated
-        # from date & time, i.e., if IMASS = 3 on Card 17, thus overwriting the input SUNCOR value on
-        # Card 11. If solar position is directly input instead (IMASS = 3), SUNCOR should be set to 1.0 if
-        # the average extraterrestrial irradiance (or solar constant, see SOLARC) is to be used, or to any
-        # other number between 0.966 and 1.034 to correct it for distance if so desired.
 
-    SOLARC = '1367.0' #Solar constant
-    
-    
-    ## Card 12: Output results selection:
-    # IPRT is an option to select the results to be printed on Files 16 and 17. Only broadband results are
-    # output (to File 16) if IPRT = 0. Spectral results are added to File 16,
-    # and Card 12a is read, if IPRT = 1. Spectral results are rather printed to
-    # File 17 (in a spreadsheet-like format) if IPRT = 2. Finally, spectral
-    # results are printed to both File 16 and 17 if IPRT = 3. Cards 
-    # 12b and 12c are read if IPRT = 2 or 3 (see IOTOT and IOUT).
-    IPRT = '2'
-    
-    # Card 12a: Min, Max and Step wavelength (nm) (Output can be different than
-    # calculation...
-    WPMN = WLMN
-    WPMX = WLMX
-    INTVL = '.5'
-    
-    # Card 12b: Total number of output variables:
-    #IOTOT = XXX #This is determined with the input of this function
-    
-    # Card 12c: Variables to output selection 
-    #(space separated numbers 1-43 according to the table below:
-    #IOUT = '30 31'
-    
-    
-    ## Card 13: Circumsolar Calculation
-    # ICIRC is an option controlling the calculation of circumsolar radiation, which is useful when
-    # simulating any type of radiometer (spectral or broadband) equipped with a collimator.
-    # ICIRC = 0 bypasses these calculations.
-    # ICIRC = 1 indicates that a typical radiometer needs to be simulated. The geometry of its collimator
-    # must then defined on Card 13a.
-    
-    ICIRC = '0'
-    
-    #Card 13a (if ICIRC = 1): SLOPE, APERT, LIMIT
-    SLOPE = ''
-    APERT = ''
-    LIMIT = ''
-    
-    ## Card 14 Option for using the scanning/smoothing virtual filter of the postprocessor.
-    # The smoothed results are output on a spreadsheet-ready file, File 18 (``smarts295.scn.txt``). This postprocessor is
-    # activated if ISCAN = 1, not if ISCAN = 0. Card 14a is read if ISCAN = 1.
-    
-    ISCAN = '0'
-    
-    # Card 14a (if ISCAN = 1): IFILT, WV1, WV2, STEP, FWHM
-    IFILT = ''
-    WV1 = ''
-    WV2 = ''
-    STEP = ''
-    FWHM = ''
-    
-    ## Card 15 ILLUM: Option for illuminance, luminous efficacy and photosynthetically active radiation (PAR)
-    # calculations. These calculations take place if ILLUM = -1, 1, -2 or 2, and are bypassed if ILLUM = 0.
-    # With ILLUM = -1 or 1, illuminance calculations are based on the CIE photopic curve (or Vlambda
-    # curve) of 1924, as supplied in File ``VLambda.dat``. With ILLUM = -2 or 2, the same calculations are
-    # done but the revised CIE photopic curve of 1988 is rather used (from File ``VMLambda.dat``). Note
-    # that selecting ILLUM = 1 or -1 will override WLMN and WLMX (see Card 11) so that calculations
-    # are done between at least 360 and 830 nm.
-    # Moreover, if ILLUM = 1 or 2, luminous efficacy calculations are added to the illuminance
-    # calculations. This overrides the values of WLMN and WLMX on Card 11, and replaces them by 280
-    # and 4000, respectively.
-    
-    ILLUM = '0'
-    
-    ## Card  16: Option for special broadband UV calculations. Select IUV = 0 for no special UV calculation, 
-    # IUV = 1 to initiate such calculations. These include UVA, UVB, UV index, and
-    # different action weighted irradiances of interest in photobiology.
-    # Note that IUV = 1 overrides WLMN and WLMX so that calculations are done between at least 280
-    # and 400 nm. The spectral results are also printed between at least 280 and 400 nm, irrespective of
-    # the IPRT, WPMN, and WPMX values.
-    
-    IUV = '0'
+def SMARTSTMY3(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE, RHOG,
+               W, RH, TAIR, SEASON, TDAY, SPR, HEIGHT='0',
+               material='DryGrass', min_wvl='280', max_wvl='4000', SMARTSPATH=None):
+
+    r'''
+    This function calculates the spectral albedo for a given material. If no 
+    material is provided, the function will return a list of all valid 
+    materials.
+
+    Parameters
+    ----------
+    material : string
+        Unique identifier for ground cover. Pass None to retreive a list of
+        all valid materials.
+    WLMN : string
+        Minimum wavelength to retreive
+    WLMX : string
+        Maximum wavelength to retreive
+    YEAR : string
+        Year
+    MONTH : string
+        Month
+    DAY : string
+        Day
+    HOUR : string
+        Hour, in 24 hour format.
+    LATIT : string
+        Latitude of the location.
+    LONGIT : string
+        Longitude of the location.
+    ALTIT : string
+        elevation of the ground surface above sea level [km].
+        WARNING: Please note that TMY3 data is in meters, convert before using this
+        function.
+    ZONE : string
+        Timezone
+    RHOG : string
+        Local broadband Lambertian foreground albedo (for tilted plane calculations)
+    W : string
+        Precipitable water above the site altitude, in units of cm or equivalently
+        g/cm2/
+    RH : string
+        Relative Humidity
+    TAIR : string
+        Temperature.
+    SEASON : string
+        Season, either 'WINTER' or 'SUMMER'. If Spring, use 'SUMMER'. If
+        Autumn, use 'WINTER'.
+    TDAY : string
+        Average of the day's temperature.        
+    HEIGHT : string
+        Altitude of the simulated object over the surface, in km.
+    SPR : string
+        Site pressure, in mbars.
+        
+    Returns
+    -------
+    data : pandas
+        Matrix with first column representing wavelength (in nm) and second
+        column representing albedo of specified material at the wavelength.
+        Wavelengths are float64 and the outputs float32, which holds all the
+        digits SMARTS prints. Results are cached on the SMARTS inputs; clear them with
+        ``pySMARTS.clear_cache()``.
     
-    ## Card 17:
-    # Option for solar position and air mass calculations. Set IMASS to:
-    # 0, if inputs are to be ZENIT, AZIM on Card 17a
-    # 1, if inputs are to be ELEV, AZIM on Card 17a
-    # 2, if input is to be AMASS on Card 17a
-    # 3, if inputs are to be YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE on Card 17a
-    # 4, if inputs are to be MONTH, LATIT, DSTEP on Card 17a (for a daily calculation).
-    IMASS = '3'
+    '''
 
+    if not material:
+        return _material_to_code(material)
+
+    if float(ALTIT) > 800:
+        warnings.warn("Altitude should be in km. Are you in Mt. Everest or above or "
+                      "using meters? This might fail but we'll attempt to continue.")
     
-    # Card 17a: IMASS = 0 Zenith and azimuth
-    ZENITH = ''
-    AZIM = ''
-    
-    # Card 17a: IMASS = 1 Elevation and Azimuth
-    ELEV = ''
-    
-    # Card 17a: IMASS = 2 Input air mass directly
-    AMASS = ''
-    
-    # Card 17a: IMASS = 3 Input date, time and coordinates
-    YEAR = YEAR
-    MONTH = MONTH
-    DAY = DAY
-    HOUR = HOUR
-    LATIT = LATIT
-    LONGIT = LONGIT
-    ZONE = ZONE
-    
-    # Card 17a: IMASS = 4 Input Moth, Latitude and DSTEP
-    DSTEP = ''
+    # Card 4: W is an input, unless it is out of range and has to be
+    # calculated from TAIR and RH.
+    IH2O = '0'
+    if float(W) == 0 or float(W) > 12:
+        warnings.warn("Switching to calculating W")
+        IH2O = '2'
+
+    cfg = _DEFAULT_CONFIG._replace(
+        CMNT='TMY Parameters Spectra',
+        ISPR='1', SPR=SPR, ALTIT=ALTIT, HEIGHT=HEIGHT,        # Card 2a
+        IATMOS='0', RH=RH, TAIR=TAIR, SEASON=SEASON, TDAY=TDAY,  # Card 3a
+        IH2O=IH2O, W=W,                                       # Card 4a
+        IALBDX=_material_to_code(material),                   # Card 10
+        IALBDG='-1', RHOG=RHOG,                               # Cards 10c and 10d
+        WLMN=min_wvl, WLMX=max_wvl,                           # Card 11
+        WPMN=min_wvl, WPMX=max_wvl, IOUT=IOUT,                # Cards 12a-12c
+        IMASS='3', YEAR=YEAR, MONTH=MONTH, DAY=DAY, HOUR=HOUR,
+        LATIT=LATIT, LONGIT=LONGIT, ZONE=ZONE)                # Cards 17 and 17a
 
-    output = _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, AZIM, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP, SMARTSPATH)
+    output = _smartsAll(cfg, SMARTSPATH)
 
     return output
 
@@ -1993,431 +1388,335 @@ def SMARTSSRRL(IOUT,YEAR,MONTH,DAY,HOUR, LATIT, LONGIT, ALTIT, ZONE,
     WAZIM : string
         Surface azimuth (0 to 360 decimal deg.) counted clockwise from North;
         e.g., 270 deg. for a surface facing West. Use -999 for a sun-tracking
-        surface.
-    RHOG : string
-        Local broadband Lambertian foreground albedo (for tilted plane calculations),
-        usually between 0.05 and 0.90.
-        This is, for example, SRRL_BMS['Albedo (CMP11)']
-    material : string
-        Unique identifier for ground cover. Pass None to retrieve a list of
-        all valid materials.
-    WLMN : string
-        Minimum wavelength to retreive, e.g. '280.0'
-    WLMX : string
-        Maximum wavelength to retreive, e.g. '4000'
-
-    Returns
-    -------
-    data : pandas
-        Matrix with first column representing wavelength (in nm) and second
-        column representing albedo of specified material at the wavelength
-    
-    '''
-
-    if float(ALTIT) > 800:
-        print("Altitude should be in km. Are you in Mt. Everest or above or",
-              "using meters? This might fail but we'll attempt to continue.")
-    
-    ## Card 1: Comment. 64 characters max. In theory no spaces but yes underscores.
-    CMNT = 'SRRL Spectra'    
-    
-    ## Card 2: ISPR is an option for site's pressure.
-    # ISPR = 0 to input SPR on Card 2a
-    # ISPR = 1 to input SPR, ALTIT and HEIGHT on Card 2a
-    # ISPR = 2 to input LATIT, ALTIT and HEIGHT on Card 2a.
-    ISPR = '1'
-    
-    # Card 2a (if ISPR = 0): SPR
-    SPR = SPR #mbar
-    
-    # Card 2a (if ISPR = 1): SPR, ALTIT, HEIGHT
-    # SPR: Surface pressure (mb).
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    # Card 2a (if ISPR = 2): LATIT, ALTIT, HEIGHT
-    # LATIT: Site's latitude (decimal degrees, positive North, negative South); e.g., -17.533 for
-    # Papeete, Tahiti. If LATIT is unknown, enter 45.0.
-    # ALTIT: Site's altitude, i.e., elevation of the ground surface above sea level (km); must be
-    # <= 100 km. In case of a flying object, ALTIT refers to the ground surface below it.
-    # HEIGHT: Height of the simulated object above the ground surface underneath (km); must be
-    # <= 100 km (new input).
-    # The total ALTIT + HEIGHT is the altitude of the simulated object above sea level and
-    # must be <= 100 km.
-    
-    ALTIT = ALTIT
-    HEIGHT = HEIGHT
-    #LATIT = LATIT
-    
-    ## Card 3: IATMOS is an option to select the proper default atmosphere
-    # Its value can be either 0 or 1.
-    # Set IATMOS = 0 to define a realistic (i.e., non-reference) atmosphere. Card 3a will then have to
-    # provide TAIR, RH, SEASON, TDAY.
-    # Set IATMOS = 1 to select one of 10 default reference atmospheres (i.e., for ideal conditions). The
-    # shortened name of this atmosphere must be provided by ATMOS on Card 3a.
-    
-    IATMOS = '0'
-    
-    # Card 3a (if IATMOS = 1): ATMOS
-    # ATMOS is the name of the selected reference atmosphere; 4 characters max. This name can
-    # be one of the following: 
-    #    USSA   (U.S. Standard Atmosphere)   MLS   (Mid-Latitude Summer) 
-    #    MLW   (Mid-Latitude Winter)   SAS   (Sub-Arctic Summer) 
-    #   SAW   (Sub-Arctic Winter)   TRL   (Tropical)   STS   (Sub-Tropical Summer)
-    #   STW   (Sub-Tropical Winter)   AS   (Arctic Summer)   AW   (Arctic Winter)
-    
-    ATMOS = 'USSA'
-    
-    # Card 3a(if IATMOS = 0): TAIR, RH, SEASON, TDAY.
-    # RH: Relative humidity at site level (%).
-    # SEASON: Can be either `WINTER` or `SUMMER`, for calculation of precipitable water and
-    # stratospheric temperature. If the true season is Fall, select WINTER. Select SUMMER if the
-    # true season is Spring. SEASON slightly affects the ozone effective temperature and the
-    # aerosol optical characteristics.
-    # TAIR: Atmospheric temperature at site level (°C). Acceptable range: -120 < TAIR < 50.
-    # TDAY: Average daily temperature at site level (°C). For a flying object (HEIGHT > 0), this
-    # is a reference temperature for various calculations, therefore it is important to provide a
-    # realistic value in this case in particular. Acceptable range: -120 < TDAY < 50.
-    
-    RH = RH
-    TAIR = TAIR
-    SEASON = SEASON
-    TDAY = TDAY
-    
-    ## Card 4: IH2O is an option to select the correct water vapor data. All water vapor calculations involve
-    # precipitable water, W. The following values of IH2O are possible:
-    # 0, to input W on Card 4a
-    # 1, if W is to be defaulted to a value prescribed by the selected reference atmosphere and the site
-    # altitude (thus if IATMOS = 1 on Card 3). If IATMOS != 1, USSA will be defaulted for this step.
-    # 2, if W is to be calculated by the program from TAIR and RH (thus if IATMOS = 0 on Card 3). This
-    # calculation is only approximate (particularly if HEIGHT > 0) and therefore this option is not
-    # recommended.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IH2O = '0'
-    
-    # Card 4a: (if IH2O = 0): W is precipitable water above the site altitude
-    # in units of cm, or equivalently, g/cm2; it must be <= 12.
-    
-    W = W
-    
-    ## Card 5: IO3 is an option to select the appropriate ozone abundance input.
-    # IO3 = 0 to input IALT and AbO3 on Card 5a
-    # IO3 = 1 to use a default value for AbO3 according to the reference atmosphere selected by
-    # IATMOS. If IATMOS != 1, USSA will be defaulted for this calculation.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    IO3 = '1'
-
-    # Card 5a (if IO3 = 0): IALT, AbO3
-    # IALT is an option to select the appropriate ozone column altitude correction.
-    # IALT = 0 bypasses the altitude correction, so that the value of AbO3 on
-    # Card 5a is used as is. IALT = 1 should be rather used if a vertical
-    # profile correction needs to be applied (in case of an elevated site when
-    # the value of AbO3 is known only at sea level). 
-    IALT = ''
-    AbO3 = ''
-    
-    ## Card 6 IGAS is an option to define the correct conditions for gaseous absorption and atmospheric pollution. 
-    # IGAS = 0 if ILOAD on Card 6a is to be read so that extra gaseous absorption calculations
-    # (corresponding to the gas load in the lower troposphere due to pollution or absence thereof) can be
-    # initiated;
-    # IGAS =1 if all gas abundances (except carbon dioxide, ozone and water vapor see Cards 4a, 5a,
-    # and 7) are to be defaulted, using average vertical profiles.
-    # If IATMOS = 0 is selected, then IH2O should be 0 or 2; IO3 and IGAS should be 0.
-    # If IATMOS = 1 is selected, then IH2O, IO3, and IGAS may take any value. All user inputs
-    # have precedence over the defaults.
-    
-    IGAS = '0'
-    
-    # Card 6a  (if IGAS = 0): ILOAD is an option for tropospheric pollution, only used if IGAS = 0.
-    # For ILOAD = 0, Card 6b will be read with the concentrations of 10 pollutants.
-    # ILOAD = 1 selects default PRISTINE ATMOSPHERIC conditions, leading to slightly
-    # reduced abundances of some gases compared to the initial default obtained with the selected
-    # reference atmosphere.
-    # Setting ILOAD to 2-4 will increase the concentration of the 10 pollutants to possibly
-    # represent typical urban conditions: LIGHT POLLUTION (ILOAD = 2), MODERATE
-    # POLLUTION (ILOAD = 3), and SEVERE POLLUTION (ILOAD = 4).
-    
-    ILOAD = '1'
-    
-    # Card 6b (if IGAS = 0 and ILOAD = 0): ApCH2O, ApCH4, ApCO, ApHNO2,
-    # ApHNO3, ApNO, ApNO2, ApNO3, ApO3, ApSO2
-    # ApCH2O: Formaldehyde volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApCH4: Methane volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApCO: Carbon monoxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv), Card 6b.
-    # ApHNO2: Nitrous acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApHNO3: Nitric acid volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO: Nitric oxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO2: Nitrogen dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApNO3: Nitrogen trioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    # ApO3: Ozone volumetric concentration in the assumed 1-km deep tropospheric pollution
-    # layer (ppmv).
-    # ApSO2: Sulfur dioxide volumetric concentration in the assumed 1-km deep tropospheric
-    # pollution layer (ppmv).
-    
-    ApCH2O = ''
-    ApCH4 = ''
-    ApCO = ''
-    ApHNO2 = ''
-    ApHNO3 = ''
-    ApNO = ''
-    ApNO2 = ''
-    ApNO3 = ''
-    ApO3 = ''
-    ApSO2 =''
-    
-    ## Card 7 qCO2 carbon dioxide columnar volumetric concentration (ppmv).
-    qCO2 = '0.0'
-    
-    # Card 7a ISPCTR 
-    # is an option to select the proper extraterrestrial
-    # spectrum. This option allows to choose one out of ten possible spectral
-    # files (``Spctrm_n.dat``, where n = 0-8 or n = U).  
-    # -1  Spctrm_U.dat  N/A User User
-    # 0  Spctrm_0.dat  N/A Gueymard, 2004 (synthetic) 1366.10
-    # 1  Spctrm_1.dat  N/A Gueymard, unpublished (synthetic) 1367.00
-    # 2  Spctrm_2.dat  cebchkur MODTRAN, Cebula/Chance/Kurucz 1362.12
-    # 3  Spctrm_3.dat  chkur MODTRAN, Chance/Kurucz 1359.75
-    # 4  Spctrm_4.dat  newkur MODTRAN, New Kurucz 1368.00
-    # 5  Spctrm_5.dat  oldkur MODTRAN, Old Kurucz 1373.16
-    # 6  Spctrm_6.dat  thkur MODTRAN, Thuillier/Kurucz 1376.23
-    # 7  Spctrm_7.dat  MODTRAN2 Wehrli/WRC/WMO, 1985 1367.00
-    # 8  Spctrm_8.dat  N/A ASTM E490, 2000 (synthetic) 1366.10
-    
-    ISPCTR ='0'
-    
-    ## Card 8: AEROS selects the aerosol model, with one of the following twelve possible choices:
-    #  S&F_RURAL ,  S&F_URBAN ,  S&F_MARIT ,  S&F_TROPO , These four choices
-    # refer respectively to the Rural, Urban, Maritime and Tropospheric aerosol
-    # models (Shettle and Fenn, 1979), which are humidity dependent and common with MODTRAN. 
-    #  SRA_CONTL ,  SRA_URBAN ,  SRA_MARIT , These three choices refer
-    # respectively to the Continental, Urban, and Maritime aerosol models of
-    # the IAMAP preliminary standard atmosphere (IAMAP, 1986). 
-    #  B&D_C ,  B&D_C1 , These two choices refer respectively to the Braslau &
-    # Dave aerosol type C and C1, themselves based on Deirmendjian's Haze L model. 
-    #  DESERT_MIN ,  DESERT_MAX  DESERT_MIN corresponds to background (normal)
-    # conditions in desert areas, whereas DESERT_MAX corresponds to extremely
-    # turbid conditions (sandstorms).  
-    # 'USER' Card 8a is then necessary to input user-supplied aerosol information.
-    
-    AEROS = 'USER' #'S&F_TROPO' 
-    # Card 8a: 
-    # if AEROS =  USER : ALPHA1, ALPHA2, OMEGL, GG These 4 variables must represent broadband average values only!
-    # ALPHA1: Average value of Ångström's wavelength exponent $\alpha$ for wavelengths < 500 nm
-    # (generally between 0.0 and 2.6).
-    # ALPHA2: Average value of Ångström's wavelength exponent $\alpha$ for wavelengths >= 500 nm
-    # (generally between 0.0 and 2.6).
-    # OMEGL: Aerosol single scattering albedo (generally between 0.6 and 1.0).
-    # GG: Aerosol asymmetry parameter (generally between 0.5 and 0.9).
-    ALPHA1 = ALPHA1
-    ALPHA2 = ALPHA2
-    OMEGL = OMEGL
-    GG = GG
-    
-    ## Card 9: ITURB is an option to select the correct turbidity data input. The different options are:
-    # 0, to read TAU5 on Card 9a
-    # 1, to read BETA on Card 9a
-    # 2, to read BCHUEP on Card 9a
-    # 3, to read RANGE on Card 9a
-    # 4, to read VISI on Card 9a
-    # 5, to read TAU550 on Card 9a (new option).
+        surface.
+    RHOG : string
+        Local broadband Lambertian foreground albedo (for tilted plane calculations),
+        usually between 0.05 and 0.90.
+        This is, for example, SRRL_BMS['Albedo (CMP11)']
+    material : string
+        Unique identifier for ground cover. Pass None to retrieve a list of
+        all valid materials.
+    WLMN : string
+        Minimum wavelength to retreive, e.g. '280.0'
+    WLMX : string
+        Maximum wavelength to retreive, e.g. '4000'
+
+    Returns
+    -------
+    data : pandas
+        Matrix with first column representing wavelength (in nm) and second
+        column representing albedo of specified material at the wavelength.
+        Wavelengths are float64 and the outputs float32, which holds all the
+        digits SMARTS prints. Results are cached on the SMARTS inputs; clear them with
+        ``pySMARTS.clear_cache()``.
     
-    ITURB = '1'
+    '''
+
+    if not material:
+        return _material_to_code(material)
+
+    if float(ALTIT) > 800:
+        warnings.warn("Altitude should be in km. Are you in Mt. Everest or above or "
+                      "using meters? This might fail but we'll attempt to continue.")
     
-    #Card 9a Turbidity value
+    # Card 9a: turbidity is given by BETA if available, else by TAU5.
     if BETA is not None:
-        BETA = BETA
         TAU5 = ''
     else:
-        TAU5 = TAU5
-        BETA = '' 
-    BCHUEP = '' #if ITURB == 2
-    RANGE = '' #if ITURB == 3
-    VISI = '' #if ITURB == 4
-    TAU550 = '' #if ITURB == 5
-    
-    ## Card 10: Far Field Albedo for backscattering
-    IALBDX = _material_to_code(material)
-    
-    # Card 10a:
-    RHOX = ''
-                            # Zonal broadband Lambertian ground albedo (for backscattering calculations); must
-                            # be between 0 and 1.
-                            
-    # Card 10b: ITILT is an option for tilted surface calculations. 
-    #Select ITILT= 0 for no such calculation, 
-    #ITILT = 1 to initiate these calculations using information on Card 10c.
-    if POA:
-        ITILT = '1'
-    else:
-        ITILT = '0'
+        BETA = ''
+
+    cfg = _DEFAULT_CONFIG._replace(
+        CMNT='SRRL Spectra',
+        ISPR='1', SPR=SPR, ALTIT=ALTIT, HEIGHT=HEIGHT,        # Card 2a
+        IATMOS='0', RH=RH, TAIR=TAIR, SEASON=SEASON, TDAY=TDAY,  # Card 3a
+        IH2O='0', W=W,                                        # Card 4a
+        AEROS='USER', ALPHA1=ALPHA1, ALPHA2=ALPHA2,
+        OMEGL=OMEGL, GG=GG,                                   # Cards 8 and 8a
+        ITURB='1', TAU5=TAU5, BETA=BETA,                      # Cards 9 and 9a
+        IALBDX=_material_to_code(material),                   # Card 10
+        ITILT='1' if POA else '0',                            # Card 10b
+        IALBDG='-1', TILT=TILT, WAZIM=WAZIM, RHOG=RHOG,       # Cards 10c and 10d
+        WLMN=min_wvl, WLMX=max_wvl,                           # Card 11
+        WPMN=min_wvl, WPMX=max_wvl, IOUT=IOUT,                # Cards 12a-12c
+        IMASS='3', YEAR=YEAR, MONTH=MONTH, DAY=DAY, HOUR=HOUR,
+        LATIT=LATIT, LONGIT=LONGIT, ZONE=ZONE)                # Cards 17 and 17a
+
+    output = _smartsAll(cfg, SMARTSPATH)
 
-    # Card 10c:
-    # IALBDG is identical to IALBDX (see Card 10) except that it relates to the foreground local
-    # albedo seen by a tilted surface. The list of options is identical to that of IALBDG and thus
-    # extends from 1 to 64 (new).
-    # TILT: Tilt angle of the receiving surface (0 to 90 decimal deg.); e.g. 90.0 for a vertical
-    # plane. Use -999 for a sun-tracking surface.
-    # WAZIM: Surface azimuth (0 to 360 decimal deg.) counted clockwise from North; e.g., 270
-    # deg. for a surface facing West. Use -999 for a sun-tracking surface.
-    
-    IALBDG = '-1'
-    TILT = TILT
-    WAZIM = WAZIM
-    
-    # Card 10d:
-    # RHOG: Local broadband Lambertian foreground albedo (for tilted plane calculations), Card
-    # 10d (if IALBDG = -1); usually between 0.05 and 0.90.
-    RHOG = RHOG
-    
-    ## Card 11: Spectral range for all Calculations
-    WLMN = min_wvl #Min wavelength
-    WLMX = max_wvl #Max wavelength
-    SUNCOR = '1.0' 
-        #Correction factor for irradiance is a correction factor equal to the inverse squared actual radius vector, or true Sun-Earth
-        # distance; e.g., SUNCOR = 1.024.
-        # SUNCOR varies naturally between 0.966 and 1.034, adding 3.4% to the irradiance in January
-        # and reducing it by 3.4% in July. It is calculated by the program if the solar position is calculated
-        # from date & time, i.e., if IMASS = 3 on Card 17, thus overwriting the input SUNCOR value on
-        # Card 11. If solar position is directly input instead (IMASS = 3), SUNCOR should be set to 1.0 if
-        # the average extraterrestrial irradiance (or solar constant, see SOLARC) is to be used, or to any
-        # other number between 0.966 and 1.034 to correct it for distance if so desired.
+    return output
 
-    SOLARC = '1367.0' #Solar constant
-    
-    
-    ## Card 12: Output results selection:
-    # IPRT is an option to select the results to be printed on Files 16 and 17. Only broadband results are
-    # output (to File 16) if IPRT = 0. Spectral results are added to File 16,
-    # and Card 12a is read, if IPRT = 1. Spectral results are rather printed to
-    # File 17 (in a spreadsheet-like format) if IPRT = 2. Finally, spectral
-    # results are printed to both File 16 and 17 if IPRT = 3. Cards 
-    # 12b and 12c are read if IPRT = 2 or 3 (see IOTOT and IOUT).
-    IPRT = '2'
-    
-    # Card 12a: Min, Max and Step wavelength (nm) (Output can be different than
-    # calculation...
-    WPMN = WLMN
-    WPMX = WLMX
-    INTVL = '.5'
-    
-    # Card 12b: Total number of output variables:s
-    #IOTOT = XXX #This is determined with the input of this function
-    
-    # Card 12c: Variables to output selection 
-    #(space separated numbers 1-43 according to the table below:
-    IOUT = IOUT
-    
-    
-    ## Card 13: Circumsolar Calculation
-    # ICIRC is an option controlling the calculation of circumsolar radiation, which is useful when
-    # simulating any type of radiometer (spectral or broadband) equipped with a collimator.
-    # ICIRC = 0 bypasses these calculations.
-    # ICIRC = 1 indicates that a typical radiometer needs to be simulated. The geometry of its collimator
-    # must then defined on Card 13a.
-    
-    ICIRC = '0'
-    
-    #Card 13a (if ICIRC = 1): SLOPE, APERT, LIMIT
-    SLOPE = ''
-    APERT = ''
-    LIMIT = ''
-    
-    ## Card 14 Option for using the scanning/smoothing virtual filter of the postprocessor.
-    # The smoothed results are output on a spreadsheet-ready file, File 18 (smarts295.scn.txt). This postprocessor is
-    # activated if ISCAN = 1, not if ISCAN = 0. Card 14a is read if ISCAN = 1.
-    
-    ISCAN = '0'
-    
-    # Card 14a (if ISCAN = 1): IFILT, WV1, WV2, STEP, FWHM
-    IFILT = ''
-    WV1 = ''
-    WV2 = ''
-    STEP = ''
-    FWHM = ''
-    
-    ## Card 15 ILLUM: Option for illuminance, luminous efficacy and photosynthetically active radiation (PAR)
-    # calculations. These calculations take place if ILLUM = -1, 1, -2 or 2, and are bypassed if ILLUM = 0.
-    # With ILLUM = -1 or 1, illuminance calculations are based on the CIE photopic curve (or Vlambda
-    # curve) of 1924, as supplied in File ``VLambda.dat``. With ILLUM = -2 or 2, the same calculations are
-    # done but the revised CIE photopic curve of 1988 is rather used (from File ``VMLambda.dat``). Note
-    # that selecting ILLUM = 1 or -1 will override WLMN and WLMX (see Card 11) so that calculations
-    # are done between at least 360 and 830 nm.
-    # Moreover, if ILLUM = 1 or 2, luminous efficacy calculations are added to the illuminance
-    # calculations. This overrides the values of WLMN and WLMX on Card 11, and replaces them by 280
-    # and 4000, respectively.
-    
-    ILLUM = '0'
-    
-    ## Card  16: Option for special broadband UV calculations. Select IUV = 0 for no special UV calculation, 
-    # IUV = 1 to initiate such calculations. These include UVA, UVB, UV index, and
-    # different action weighted irradiances of interest in photobiology.
-    # Note that IUV = 1 overrides WLMN and WLMX so that calculations are done between at least 280
-    # and 400 nm. The spectral results are also printed between at least 280 and 400 nm, irrespective of
-    # the IPRT, WPMN, and WPMX values.
-    
-    IUV = '0'
-    
-    ## Card 17:
-    # Option for solar position and air mass calculations. Set IMASS to:
-    # 0, if inputs are to be ZENIT, AZIM on Card 17a
-    # 1, if inputs are to be ELEV, AZIM on Card 17a
-    # 2, if input is to be AMASS on Card 17a
-    # 3, if inputs are to be YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE on Card 17a
-    # 4, if inputs are to be MONTH, LATIT, DSTEP on Card 17a (for a daily calculation).
-    IMASS = '3'
 
-    
-    # Card 17a: IMASS = 0 Zenith and azimuth
-    ZENITH = ''
-    AZIM = ''
-    
-    # Card 17a: IMASS = 1 Elevation and Azimuth
-    ELEV = ''
-    
-    # Card 17a: IMASS = 2 Input air mass directly
-    AMASS = ''
-    
-    # Card 17a: IMASS = 3 Input date, time and coordinates
-    YEAR = YEAR
-    MONTH = MONTH
-    DAY = DAY
-    HOUR = HOUR
-    LATIT = LATIT
-    LONGIT = LONGIT
-    ZONE = ZONE
-    
-    # Card 17a: IMASS = 4 Input Moth, Latitude and DSTEP
-    DSTEP = ''
+def SMARTSRunMany(configs, SMARTSPATH=None, n_jobs=None):
+    r'''
+    Runs SMARTS for every SMARTSConfig of a list, several at the same time.
+    Each run works in its own scratch folder and results are cached, as for
+    the other functions.
+
+    Parameters
+    ----------
+    configs : list of SMARTSConfig
+        Full sets of input cards, i.e. ``SMARTSConfig()._replace(...)``.
+    n_jobs : int or None
+        Number of SMARTS runs executed at the same time. None (default) uses
+        one per CPU; 1 runs them one after the other.
+
+    Returns
+    -------
+    data : list
+        One pandas DataFrame per config, formatted like the output of
+        SMARTSAirMass, or None for runs that failed.
+    '''
+    return _map_runs(lambda cfg: _smartsAll(cfg, SMARTSPATH), list(configs), n_jobs)
 
-    output = _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, AZIM, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP, SMARTSPATH)
 
-    return output
+@functools.lru_cache(maxsize=128)
+def _albedo_table(path, mtime):
+    r''' Parses a SMARTS ``Albedo/*.DAT`` reflectance table into wavelength
+    [nm] and reflectance arrays. Tables are parsed once per process; mtime is
+    part of the cache key so an edited table is read again. The cache holds
+    every material's table, but is bounded so repeated edits don't grow it.
+    '''
+    # Albedo tables hold a header line and then wavelength [um], reflectance.
+    wl, rho = np.loadtxt(path, skiprows=1, unpack=True)
+    wl = wl*1000
+    wl.flags.writeable = False
+    rho.flags.writeable = False
+    return wl, rho
+
+
+def _map_runs(run, jobs, n_jobs=1):
+    r''' Returns ``[run(job) for job in jobs]``, running up to n_jobs of them at
+    the same time (None for one per CPU).
+    '''
+
+    if n_jobs == 1:
+        return [run(job) for job in jobs]
+    # SMARTS runs in a subprocess and every run has its own scratch folder, so
+    # threads are enough to keep several of them busy, and they share the
+    # result cache.
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        return list(executor.map(run, jobs))
+
+
+@functools.lru_cache(maxsize=16)
+def _smarts_entries(smartsdir, mtime):
+    r''' Names in the SMARTS folder (executable and data folders) that a run
+    needs. The folder is listed once per process; mtime is part of the cache
+    key so added or removed files are picked up. The cache is bounded since
+    runs without a scratch folder change the mtime every time.
+    '''
+
+    return tuple(name for name in sorted(os.listdir(smartsdir))
+                 # Skip input/output files of previous runs.
+                 if not (name == 'output.txt' or
+                         (name.startswith('smarts295.') and name.endswith('.txt'))))
+
+
+@functools.lru_cache(maxsize=16)
+def _smarts_command(smartsdir, mtime):
+    r''' Name of the SMARTS executable in the SMARTS folder, or None if there
+    is none. Looked up once per process (and again if the folder changes).
+    '''
+    for cmd in ('smarts295bat', 'smarts295bat.exe'):
+        if os.path.exists(os.path.join(smartsdir, cmd)):
+            return cmd
+    return None
+
+
+def _link_smarts(smartsdir, workdir):
+    r''' Links the contents of the SMARTS folder (executable and data folders)
+    into workdir so SMARTS can be run from there. Returns False if the system
+    does not allow creating symbolic links.
+    '''
+
+    for name in _smarts_entries(smartsdir, os.stat(smartsdir).st_mtime_ns):
+        try:
+            os.symlink(os.path.join(smartsdir, name), os.path.join(workdir, name))
+        except OSError:
+            return False
+    return True
+
+
+# Serializes the runs that can't get a scratch folder and share the SMARTS
+# folder instead; see _smartsAll.
+_SMARTS_FOLDER_LOCK = threading.Lock()
+
+
+def _run_smarts_deck(deck, workdir, command):
+    r''' Writes the input deck to workdir, runs the SMARTS executable there
+    and reads back its output. Returns None if SMARTS wrote no output, i.e.
+    because of an invalid input card.
+    '''
+    with open(os.path.join(workdir, 'smarts295.inp.txt'), 'w') as f:
+        f.write(deck)
+
+    # SMARTS (batch version) only talks through its files: start it
+    # directly, without a shell, and discard its console output.
+    subprocess.run([os.path.join(workdir, command)], cwd=workdir,
+                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+
+    ## Read SMARTS 2.9.5 Output File
+    data = None
+    with contextlib.suppress(FileNotFoundError):
+        data = _read_smarts_ext(os.path.join(workdir, 'smarts295.ext.txt'))
+    if data is None:
+        warnings.warn('SMARTS did not produce any output. Check the input cards.')
+    return data
+
+
+def _smarts_frame(columns, values):
+    r''' DataFrame of SMARTS results from a (wavelengths x columns) array whose
+    first column holds the wavelengths. SMARTS prints 5 significant digits
+    (i.e. 1.2345E+03) and float32 keeps about 7, so the outputs are stored
+    as float32 without losing anything, in half the memory. The
+    wavelengths stay float64 since they are used to look up and align
+    spectra.
+    '''
+    import pandas as pd
+
+    data = pd.DataFrame(values[:, 1:].astype(np.float32), columns=columns[1:])
+    data.insert(0, columns[0], values[:, 0].astype(float))
+    return data
+
+
+def _read_smarts_ext(path):
+    r''' Reads the spreadsheet-ready SMARTS output file (``smarts295.ext.txt``):
+    a header line with the column names followed by whitespace-separated
+    numbers. All cells are numeric, so they are parsed by numpy straight from
+    the text, without building a list of tokens or going through pandas'
+    generic CSV reader.
+    '''
+    with open(path, 'r') as f:
+        columns = f.readline().split()
+        if not columns:
+            return None
+        values = np.fromstring(f.read(), dtype=float, sep=' ')
+    return _smarts_frame(columns, values.reshape(-1, len(columns)))
+
+
+# SMARTS 2.9.5 input file, one line per card. The {CARDxx} slots hold the
+# optional sub-cards; they are filled from _SMARTS_SUBCARDS according to the
+# option on their parent card, or left empty when SMARTS does not read them.
+_SMARTS_INPUT_TEMPLATE = (
+    "{CMNT}\n"                                # Card 1: Comment
+    "{ISPR}\n"                                # Card 2: Site pressure
+    "{CARD2A}"
+    "{IATMOS}\n"                              # Card 3: Atmosphere model
+    "{CARD3A}"
+    "{IH2O}\n"                                # Card 4: Water vapor data
+    "{CARD4A}"
+    "{IO3}\n"                                 # Card 5: Ozone abundance
+    "{CARD5A}"
+    "{IGAS}\n"                                # Card 6: Gaseous absorption and pollution
+    "{CARD6A}"
+    "{CARD6B}"
+    "{qCO2}\n"                                # Card 7: CO2 concentration (ppmv)
+    "{ISPCTR}\n"                              # Card 7a: Extraterrestrial spectrum
+    "'{AEROS}'\n"                             # Card 8: Aerosol model
+    "{CARD8A}"
+    "{ITURB}\n"                               # Card 9: Turbidity model
+    "{CARD9A}"
+    "{IALBDX}\n"                              # Card 10: Zonal albedo
+    "{CARD10A}"
+    "{ITILT}\n"                               # Card 10b: Tilted surface calculation flag
+    "{CARD10C}"
+    "{CARD10D}"
+    "{WLMN} {WLMX} {SUNCOR} {SOLARC}\n"       # Card 11: Spectral range for calculations
+    "{IPRT}\n"                                # Card 12: Output selection
+    "{CARD12A}"
+    "{CARD12B}"
+    "{ICIRC}\n"                               # Card 13: Circumsolar calculations
+    "{CARD13A}"
+    "{ISCAN}\n"                               # Card 14: Scanning/smoothing postprocessor
+    "{CARD14A}"
+    "{ILLUM}\n"                               # Card 15: Illuminance, luminous efficacy and PAR
+    "{IUV}\n"                                 # Card 16: Special broadband UV calculations
+    "{IMASS}\n"                               # Card 17: Solar position and air mass option
+    "{CARD17A}"
+    "\n"
+)
+
+# Wavelength regions (nm) and step of the spectral grid SMARTS calculates on:
+# 2002 wavelengths, as in the ASTM G173 spectra (pySMARTS/data/astmg173.csv).
+_NATIVE_STEPS = ((280, 400, 0.5), (400, 1700, 1.0), (1700, 1702, 2.0), (1702, 1705, 3.0), (1705, 4000, 5.0))
+
+# Sub-card lines by the value of the option that selects them.
+_SMARTS_SUBCARDS = {
+    # Card 2a, by ISPR
+    'CARD2A': {'0': "{SPR}\n",
+               '1': "{SPR} {ALTIT} {HEIGHT}\n",
+               '2': "{LATIT} {ALTIT} {HEIGHT}\n"},
+    # Card 3a, by IATMOS
+    'CARD3A': {'0': "{TAIR} {RH} {SEASON} {TDAY}\n",
+               '1': "'{ATMOS}'\n"},
+    # Card 4a, by IH2O
+    'CARD4A': {'0': "{W}\n"},
+    # Card 5a, by IO3
+    'CARD5A': {'0': "{IALT} {AbO3}\n"},
+    # Card 6a, by IGAS
+    'CARD6A': {'0': "{ILOAD}\n"},
+    # Card 6b, by ILOAD (only read if IGAS = 0)
+    'CARD6B': {'0': "{ApCH2O} {ApCH4} {ApCO} {ApHNO2} {ApHNO3} {ApNO} {ApNO2} {ApNO3} {ApO3} {ApSO2} \n"},
+    # Card 8a, by AEROS
+    'CARD8A': {'USER': "{ALPHA1} {ALPHA2} {OMEGL} {GG}\n"},
+    # Card 9a, by ITURB
+    'CARD9A': {'0': "{TAU5}\n",
+               '1': "{BETA}\n",
+               '2': "{BCHUEP}\n",
+               '3': "{RANGE}\n",
+               '4': "{VISI}\n",
+               '5': "{TAU550}\n"},
+    # Card 10a, by IALBDX
+    'CARD10A': {'-1': "{RHOX}\n"},
+    # Card 10c, by ITILT
+    'CARD10C': {'1': "{IALBDG} {TILT} {WAZIM}\n"},
+    # Card 10d, by IALBDG (only read if ITILT = 1)
+    'CARD10D': {'-1': "{RHOG}\n"},
+    # Card 12a, for spectral results (IPRT >= 1)
+    'CARD12A': {True: "{WPMN} {WPMX} {INTVL}\n"},
+    # Cards 12b and 12c, for IPRT = 2 or 3
+    'CARD12B': {True: "{IOTOT}\n{IOUT}\n"},
+    # Card 13a, by ICIRC
+    'CARD13A': {'1': "{SLOPE} {APERT} {LIMIT}\n"},
+    # Card 14a, by ISCAN
+    'CARD14A': {'1': "{IFILT} {WV1} {WV2} {STEP} {FWHM}\n"},
+    # Card 17a, by IMASS
+    'CARD17A': {'0': "{ZENITH} {AZIM}\n",
+                '1': "{ELEV} {AZIM}\n",
+                '2': "{AMASS}\n",
+                '3': "{YEAR} {MONTH} {DAY} {HOUR} {LATIT} {LONGIT} {ZONE}\n",
+                '4': "{MONTH}, {LATIT}, {DSTEP}\n"},
+}
+
+
+class _Unfilled(dict):
+    # Leaves the fields that are not being filled as they are.
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+@functools.lru_cache(maxsize=64)
+def _deck_template(options):
+    r''' Input file template for one combination of sub-card options (given in
+    the order of _SMARTS_SUBCARDS, None for a skipped sub-card). The selected
+    sub-cards are spliced in once, so a sweep that only changes card values
+    formats a single template per run.
+    '''
+    subcards = _Unfilled((card, _SMARTS_SUBCARDS[card].get(option, ''))
+                         for card, option in zip(_SMARTS_SUBCARDS, options))
+    return _SMARTS_INPUT_TEMPLATE.format_map(subcards)
 
 
-def _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, AZIM, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP, SMARTSPATH=None):
+@_cached
+def _smartsAll(cfg, SMARTSPATH=None):
     r'''
-    #data = smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, SEASON, TDAY, IH2O, W, IO3, IALT, AbO3, IGAS, ILOAD, ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO,ApNO2, ApNO3, ApO3, ApSO2, qCO2, ISPCTR, AEROS, ALPHA1, ALPHA2, OMEGL, GG, ITURB, TAU5, BETA, BCHUEP, RANGE, VISI, TAU550, IALBDX, RHOX, ITILT, IALBDG,TILT, WAZIM,  RHOG, WLMN, WLMX, SUNCOR, SOLARC, IPRT, WPMN, WPMX, INTVL, IOUT, ICIRC, SLOPE, APERT, LIMIT, ISCAN, IFILT, WV1, WV2, STEP, FWHM, ILLUM,IUV, IMASS, ZENITH, ELEV, AMASS, YEAR, MONTH, DAY, HOUR, LONGIT, ZONE, DSTEP)  
+    #data = smartsAll(cfg, SMARTSPATH)
     # SMARTS Control Function
     # 
     #   Inputs:
-    #       All variables are labeled according to the SMARTS 2.9.5 documentation.
+    #       cfg, a SMARTSConfig with all the cards. Variables are labeled
+    #       according to the SMARTS 2.9.5 documentation.
     #       NOTICE THAT "IOTOT" is not an input variable of the function since is determined in the function 
     #       by sizing the IOUT variable.
     #   Outputs:
@@ -2427,313 +1726,229 @@ def _smartsAll(CMNT, ISPR, SPR, ALTIT, HEIGHT, LATIT, IATMOS, ATMOS, RH, TAIR, S
     '''
     
     ## Init
-    import os
-    import pandas as pd
-    import subprocess
-    
-    # Check if SMARTSPATH environment variable exists and change working
-    # directory if it does.
-    original_wd = None
-    if 'SMARTSPATH' in os.environ:
-        original_wd = os.getcwd()
-        os.chdir(os.environ['SMARTSPATH'])
-    else:
-        if SMARTSPATH is not None:
-            os.chdir(SMARTSPATH)
-    
-    try:
-        os.remove('smarts295.inp.txt')
-    except:
-        pass
-    #try:
-    #    os.remove('smarts295.out.txt')
-    #except:
-    #    pass  
-    #try:       
-    #    os.remove('smarts295.ext.txt')
-    #except:
-    #    pass
-    try:
-        os.remove('smarts295.scn.txt')
-    except:
-        pass
-        
-    f = open('smarts295.inp.txt', 'w')
-    
-    IOTOT = len(IOUT.split())
-    
-    ## Card 1: Comment.
-    if len(CMNT)>62:
-        CMNT = CMNT[0:61] 
-
-    CMNT = CMNT.replace(" ", "_")
-    CMNT = "'"+CMNT+"'"
-    print('{}' . format(CMNT), file=f)
-    
-    ## Card 2: Site Pressure
-    print('{}'.format(ISPR), file=f)
-    
-    ##Card 2a:
-    if ISPR=='0':
-       # case '0' #Just input pressure.
-        print('{}'.format(SPR), file=f)
-    elif ISPR=='1':
-        # case '1' #Input pressure, altitude and height.
-        print('{} {} {}'.format(SPR, ALTIT, HEIGHT), file=f)
-    elif ISPR=='2':
-        #case '2' #Input lat, alt and height
-        print('{} {} {}'.format(LATIT, ALTIT, HEIGHT), file=f)
-    else:
-        print("ISPR Error. ISPR should be 0, 1 or 2. Currently ISPR = ", ISPR)    
-    
-    ## Card 3: Atmosphere model
-    print('{}'.format(IATMOS), file=f)
-    
-    ## Card 3a:
-    if IATMOS=='0':
-        #case '0' #Input TAIR, RH, SEASON, TDAY
-        print('{} {} {} {}'.format(TAIR, RH, SEASON, TDAY), file=f)
-    elif IATMOS=='1':        
-        #case '1' #Input reference atmosphere
-        ATMOS = "'"+ATMOS+"'"
-        print('{}'.format(ATMOS), file=f)
-    
-    ## Card 4: Water vapor data
-    print('{}'.format(IH2O), file=f)
-    
-    ## Card 4a
-    if IH2O=='0':
-        #case '0'
-        print('{}'.format(W), file=f)
-    elif IH2O=='1':
-        #case '1'
-        #The subcard 4a is skipped
-        pass  #      print("")
-    
-    ## Card 5: Ozone abundance
-    print('{}'.format(IO3), file=f)
-    
-    ## Card 5a
-    if IO3=='0':
-        #case '0'
-        print('{} {}'.format(IALT, AbO3), file=f)
-    elif IO3=='1':
-        #case '1'
-        #The subcard 5a is skipped and default values are used from selected 
-        #reference atmosphere in Card 3. 
-        pass #      print("")
-    
-    ## Card 6: Gaseous absorption and atmospheric pollution
-    print('{}'.format(IGAS), file=f)
-    
-    ## Card 6a:  Option for tropospheric pollution
-    if IGAS=='0':
-        # case '0'
-        print('{}'.format(ILOAD), file=f)
-
-        ## Card 6b: Concentration of Pollutants        
-        if ILOAD=='0':
-            #case '0'
-            print('{} {} {} {} {} {} {} {} {} {} '.format(ApCH2O, ApCH4, ApCO, ApHNO2, ApHNO3, ApNO, ApNO2, ApNO3, ApO3, ApSO2), file=f)
-        elif ILOAD=='1':
-            #case '1'
-                #The subcard 6b is skipped and values of PRISTINE
-                #ATMOSPHERIC conditions are assumed
-            pass #     print("")
-        elif ILOAD=='2' or ILOAD =='3' or ILOAD == '4':
-            #case {'2', '3', '4'}
-            #The subcard 6b is skipped and value of ILOAD will be used
-            #as LIGHT POLLUTION (ILOAD = 2), MODERATE POLLUTION (ILOAD = 3), 
-            #and SEVERE POLLUTION (ILOAD = 4).
-            pass #     print("")
-             
-    elif IGAS=='1':
-        #case '1'
-        #The subcard 6a is skipped, and values are for default average
-        #profiles.
-        print("")
-    
-    ## Card 7:  CO2 columnar volumetric concentration (ppmv)
-    print('{}'.format(qCO2), file=f)
-    
-    ## Card 7a: Option of proper extraterrestrial spectrum
-    print('{}'.format(ISPCTR), file=f)
-    
-    ## Card 8: Aerosol model selection out of twelve
-    AEROS = "'"+AEROS+"'"
+    # Check if SMARTSPATH environment variable exists and use it as the SMARTS
+    # folder if it does. Otherwise use the SMARTSPATH argument, or the current
+    # working directory if neither is set.
+    smartsdir = _smarts_dir(SMARTSPATH)
+
+    # Card 12: IPRT is parsed once; it decides which of Cards 12a-12c are read.
+    IPRT = float(cfg.IPRT)
+    # Card 12b: IOTOT is determined by sizing IOUT. Without any output there
+    # is nothing to read back, so don't launch SMARTS.
+    IOTOT = len(cfg.IOUT.split())
+    if IPRT in (2, 3) and not IOTOT:
+        warnings.warn("IOUT Error. Select at least one output code with IOUT. Currently IOUT = {!r}".format(cfg.IOUT))
+        return None
 
-    print('{}'.format(AEROS), file=f)
-    
-    ## Card 8a: If the aerosol model is 'USER' for user supplied information
-    if AEROS=="'USER'":
-        print('{} {} {} {}'.format(ALPHA1, ALPHA2, OMEGL, GG), file=f)
-    else:
-        #The subcard 8a is skipped
-        pass #     print("")
-    
-    ## Card 9: Option to select turbidity model
-    print('{}'.format(ITURB), file=f)
-    
-    ## Card 9a
-    if ITURB=='0':
-        #case '0'
-        print('{}'.format(TAU5), file=f)
-    elif ITURB=='1':
-        #case '1'
-        print('{}'.format(BETA), file=f)
-    elif ITURB=='2':
-        #case '2'
-        print('{}'.format(BCHUEP), file=f)
-    elif ITURB=='3':
-        #case '3'
-        print('{}'.format(RANGE), file=f)
-    elif ITURB=='4':
-        #case '4'
-        print('{}'.format(VISI), file=f)
-    elif ITURB=='5':
-        #case '5'
-        print('{}'.format(TAU550), file=f)
-    else:
-        print("Error: Card 9 needs to be input. Assign a valid value to ITURB = ", ITURB)
-    
-    ## Card 10:  Select zonal albedo
-    print('{}'.format(IALBDX), file=f)
-    
-    ## Card 10a: Input fix broadband lambertial albedo RHOX
-    if IALBDX == '-1':
-        print('{}'.format(RHOX), file=f)
-    else:
-        pass #     print("")
-        #The subcard 10a is skipped.
-    
-    ## Card 10b: Tilted surface calculation flag
-    print('{}'.format(ITILT), file=f)
-    
-    ## Card 10c: Tilt surface calculation parameters
-    if ITILT == '1':
-        print('{} {} {}'.format(IALBDG, TILT, WAZIM), file=f)
-        
-        ##Card 10d: If tilt calculations are performed and zonal albedo of
-        ##foreground.
-        if IALBDG == '-1': 
-            print('{}'.format(RHOG), file=f)
-        else:
-            pass #     print("")
-            #The subcard is skipped 
-    
-    
-    ## Card 11: Spectral ranges for calculations
-    print('{} {} {} {}'.format(WLMN, WLMX, SUNCOR, SOLARC), file=f)
-    
-    ## Card 12: Output selection.
-    print('{}'.format(IPRT), file=f)
-    
-    ## Card 12a: For spectral results (IPRT >= 1) 
-    if float(IPRT) >= 1:
-        print('{} {} {}'.format(WPMN, WPMX, INTVL), file=f)
-        
-        ## Card 12b & Card 12c: 
-        if float(IPRT) == 2 or float(IPRT) == 3:
-            print('{}'.format(IOTOT), file=f)
-            print('{}'.format(IOUT), file=f)
-        else:
-            pass #     print("")
-            #The subcards 12b and 12c are skipped.
-    else:
-        pass #     print("")
-        #The subcard 12a is skipped
-    
-    ## Card 13: Circumsolar calculations
-    print('{}'.format(ICIRC), file=f)
-    
-    ## Card 13a:  Simulated radiometer parameters
-    if ICIRC == '1':
-        print('{} {} {}'.format(SLOPE, APERT, LIMIT), file=f)
-    else:
-        pass #     print("")
-        #The subcard 13a is skipped since no circumsolar calculations or
-        #simulated radiometers have been requested.
+    ## Fill the input cards
+    cards = cfg._asdict()
+
+    # Card 1: the comment is quoted and can't have spaces.
+    CMNT = cfg.CMNT[0:61] if len(cfg.CMNT) > 62 else cfg.CMNT
+    cards['CMNT'] = "'" + CMNT.replace(" ", "_") + "'"
+    cards['IOTOT'] = IOTOT
+
+    if cfg.ISPR not in _SMARTS_SUBCARDS['CARD2A']:
+        warnings.warn("ISPR Error. ISPR should be 0, 1 or 2. Currently ISPR = {}".format(cfg.ISPR))
+    if cfg.ITURB not in _SMARTS_SUBCARDS['CARD9A']:
+        warnings.warn("Error: Card 9 needs to be input. Assign a valid value to ITURB = {}".format(cfg.ITURB))
+    if IPRT >= 1 and float(cfg.INTVL) > 0.5:
+        # An output step finer than the native one only interpolates. Warned
+        # about once, not on every run of a sweep.
+        finer = [(lo, hi) for lo, hi, step in _NATIVE_STEPS
+                 if float(cfg.INTVL) < step and lo < float(cfg.WPMX) and hi > float(cfg.WPMN)]
+        if finer:
+            warnings.warn("INTVL = {} nm is finer than SMARTS' native step between {} and {} nm; "
+                          "use INTVL = .5 to get the native wavelengths without interpolation."
+                          .format(cfg.INTVL, finer[0][0], finer[-1][1]))
+
+    # Option selecting each sub-card; sub-cards of a skipped card are skipped
+    # too.
+    options = {'CARD2A': cfg.ISPR,
+               'CARD3A': cfg.IATMOS,
+               'CARD4A': cfg.IH2O,
+               'CARD5A': cfg.IO3,
+               'CARD6A': cfg.IGAS,
+               'CARD6B': cfg.ILOAD if cfg.IGAS == '0' else None,
+               'CARD8A': cfg.AEROS,
+               'CARD9A': cfg.ITURB,
+               'CARD10A': cfg.IALBDX,
+               'CARD10C': cfg.ITILT,
+               'CARD10D': cfg.IALBDG if cfg.ITILT == '1' else None,
+               'CARD12A': IPRT >= 1,
+               'CARD12B': IPRT in (2, 3),
+               'CARD13A': cfg.ICIRC,
+               'CARD14A': cfg.ISCAN,
+               'CARD17A': cfg.IMASS}
+    template = _deck_template(tuple(option if option in _SMARTS_SUBCARDS[card] else None
+                                    for card, option in options.items()))
+
+    deck = template.format_map(cards)
 
-    
-    ## Card 14:  Scanning/Smoothing virtual filter postprocessor
-    print('{}'.format(ISCAN), file=f)
-    
-    ## Card 14a:  Simulated radiometer parameters
-    if ISCAN == '1': 
-        print('{} {} {} {} {}'.format(IFILT, WV1, WV2, STEP, FWHM), file=f)
-    else:
-        pass #     print("")
-        #The subcard 14a is skipped since no postprocessing is simulated.    
-    
-    ## Card 15: Illuminace, luminous efficacy and photosythetically active radiarion calculations
-    print('{}'.format(ILLUM), file=f)
-    
-    ## Card 16: Special broadband UV calculations
-    print('{}'.format(IUV), file=f)
-    
-    ## Card 17:  Option for solar position and air mass calculations
-    print('{}'.format(IMASS), file=f)
-    
-    ## Card 17a: Solar position parameters:
-    if IMASS=='0':
-        #case '0' #Enter Zenith and Azimuth of the sun
-        print('{} {}'.format(ZENITH, AZIM), file=f)
-    elif IMASS=='1':
-        #case '1' #Enter Elevation and Azimuth of the sun
-        print('{} {}'.format(ELEV, AZIM), file=f)
-    elif IMASS=='2':
-        #case '2' #Enter air mass directly
-        print('{}'.format(AMASS), file=f)
-    elif IMASS=='3':
-        #case '3' #Enter date, time and latitude
-        print('{} {} {} {} {} {} {}'.format(YEAR, MONTH, DAY, HOUR, LATIT, LONGIT, ZONE), file=f)
-    elif IMASS=='4':
-        #case '4' #Enter date and time and step in min for a daily calculation.
-        print('{}, {}, {}'.format(MONTH, LATIT, DSTEP), file=f)
-    
-    ## Input Finalization
-    print('', file=f)
-    f.close()
-    
     ## Run SMARTS 2.9.5
     #dump = os.system('smarts295bat.exe')
-    commands = ['smarts295bat', 'smarts295bat.exe']
-    command = None
-    for cmd in commands:
-        if os.path.exists(cmd):
-            command = cmd
-            break
+    command = _smarts_command(smartsdir, os.stat(smartsdir).st_mtime_ns)
 
     if not command:
-        print('Could not find SMARTS2 executable.')
-        data = None
-    else:
-        p = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=open("output.txt", "w"), shell=True)
-        p.wait()
-        
-        ## Read SMARTS 2.9.5 Output File
-        data = pd.read_csv('smarts295.ext.txt', sep=r'\s+')    
-        # deprecated: delim_whitespace=True)
-
-    # try:
-    #     os.remove('smarts295.inp.txt')
-    # except:
-    #     pass #     print("") 
-    # try:
-    #     os.remove('smarts295.out.txt')
-    # except:
-    #     pass #     print("")     
-    # try:       
-    #     os.remove('smarts295.ext.txt')
-    # except:
-    #     pass #     print("") 
-    # try:
-    #     os.remove('smarts295.scn.txt')
-    # except:
-    #     pass #     print("") 
-    
-    # Return to original working directory.    
-    if original_wd:
-        os.chdir(original_wd)
+        warnings.warn('Could not find SMARTS2 executable.')
+        return None
+
+    # Run SMARTS on a private scratch folder so simultaneous runs (i.e. from
+    # several processes) don't overwrite each other's input and output files.
+    # Use the memory-backed /dev/shm when available (Linux), so the input and
+    # output files never hit slow or networked storage. The folder is removed
+    # even if the run fails.
+    shm = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+    with tempfile.TemporaryDirectory(prefix='pySMARTS_', dir=shm) as scratch:
+        if _link_smarts(smartsdir, scratch):
+            return _run_smarts_deck(deck, scratch, command)
+
+        # Without symbolic links (i.e. Windows without Developer Mode) every
+        # run uses the SMARTS folder itself, so threads take turns.
+        with _SMARTS_FOLDER_LOCK:
+            # Clear the files of a previous run: SMARTS won't overwrite a
+            # leftover scan file, and a stale output file would be read back
+            # if this run fails. The input file is truncated when written.
+            for name in ('smarts295.ext.txt', 'smarts295.scn.txt'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(smartsdir, name))
+            return _run_smarts_deck(deck, smartsdir, command)
+
+def band_average(wavelength, values, min_wvl, max_wvl):
+    r'''
+    Wavelength-weighted (trapezoidal) average of a spectrum over a band. Unlike
+    a plain mean of the rows, this accounts for SMARTS' uneven wavelength step
+    (0.5 nm in the UV, 1 nm in the visible/NIR and 5 nm beyond 1700 nm), so no
+    resampling to a uniform grid is needed.
+
+    Parameters
+    ----------
+    wavelength : array
+        Ascending wavelengths, i.e. the ``Wvlgth`` column of a SMARTS output.
+    values : array
+        Values at each wavelength. Can be 2D (wavelengths x columns) to
+        average several spectra at once.
+    min_wvl : numeric
+        Lower limit of the band, in the same units as wavelength.
+    max_wvl : numeric
+        Upper limit of the band, in the same units as wavelength.
+
+    Returns
+    -------
+    average : numeric or array
+        Band average, one per column of values if values is 2D.
+    '''
+    wl = np.asarray(wavelength, dtype=float)
+    y = np.asarray(values, dtype=float)
+
+    # Only intervals that fall completely inside the band are integrated.
+    dw = np.diff(wl)
+    dw = np.where((wl[:-1] >= min_wvl) & (wl[1:] <= max_wvl), dw, 0.0)
+    if y.ndim > 1:
+        dw = dw[:, None]
+    return ((y[:-1] + y[1:]) * 0.5 * dw).sum(axis=0) / dw.sum()
+
+def band_means(wavelength, values, bands):
+    r'''
+    Plain (unweighted) mean of the values inside several wavelength bands,
+    computed in a single pass over the spectrum.
+
+    Parameters
+    ----------
+    wavelength : array
+        Ascending wavelengths, i.e. the ``Wvlgth`` column of a SMARTS output.
+    values : array
+        Values at each wavelength. Can be 2D (wavelengths x columns) to
+        average several spectra at once.
+    bands : list of tuples
+        (min_wvl, max_wvl) for each band. Both limits are inclusive, and bands
+        may overlap.
+
+    Returns
+    -------
+    means : array
+        One row per band, with one value per column of values if values is 2D.
+    '''
+    wl = np.asarray(wavelength, dtype=float)
+    y = np.asarray(values, dtype=float)
+
+    lims = np.asarray(bands, dtype=float).reshape(-1, 2)
+    start = np.searchsorted(wl, lims[:, 0], side='left')
+    end = np.searchsorted(wl, lims[:, 1], side='right')
+
+    # reduceat sums y[start:end] for every (start, end) pair of the flattened
+    # boundaries; the sums between one band's end and the next band's start
+    # are dropped. A trailing zero row lets a band end at the last wavelength.
+    y = np.concatenate([y, np.zeros((1,) + y.shape[1:])])
+    sums = np.add.reduceat(y, np.column_stack([start, end]).ravel(), axis=0)[::2]
+    counts = end - start
+    if y.ndim > 1:
+        counts = counts[:, None]
+    return np.where(counts > 0, sums, np.nan) / np.maximum(counts, 1)
+
+def ffill_align(src_x, src_y, tgt_x):
+    r'''
+    Forward-fills a spectrum onto new wavelengths: each target wavelength
+    takes the value at the last source wavelength at or below it, like
+    pandas' ``reindex(method='ffill')``.
+
+    Parameters
+    ----------
+    src_x : array
+        Ascending source wavelengths, i.e. the ``Wvlgth`` column of a SMARTS
+        output.
+    src_y : array
+        Values at each source wavelength. Can be 2D (wavelengths x columns).
+    tgt_x : array
+        Ascending target wavelengths, i.e. ``WL_HALF_NM_GRID``.
+
+    Returns
+    -------
+    values : array
+        Values at each target wavelength. Targets below the first source
+        wavelength are NaN.
+    '''
+    src_y = np.asarray(src_y, dtype=float)
+    pos = np.searchsorted(np.asarray(src_x), tgt_x, side='right') - 1
+    out = src_y[np.maximum(pos, 0)]
+    out[pos < 0] = np.nan
+    return out
+
+
+def set_cache(path=None, round_ndigits=None):
+    r'''
+    Keeps SMARTS results in a folder on disk as well as in memory, so they
+    are reused by other processes and later sessions. Useful for sweeps over
+    grids of pixels or plant layouts where the same inputs recur.
 
-    return data
\ No newline at end of file
+    Parameters
+    ----------
+    path : string
+        Folder for the cached results; it is created if needed. None turns
+        the disk cache off.
+    round_ndigits : dict
+        Number of decimals to round cards to before running SMARTS, i.e.
+        ``{'LATIT': 1, 'LONGIT': 1, 'ALTIT': 2}``, so nearby inputs share
+        one run. Rounding applies to the inputs themselves, so results do
+        not depend on which input was run first.
+    '''
+
+    if path is not None:
+        os.makedirs(path, exist_ok=True)
+    _DISK_CACHE['path'] = path
+    _DISK_CACHE['round_ndigits'] = dict(round_ndigits or {})
+
+
+def clear_cache():
+    r'''
+    Empties the cache of SMARTS results. Results are keyed on the input cards
+    and the SMARTS folder only, so call this after changing files in the
+    SMARTS folder, i.e. editing the user-defined reflectance (IALBDX = 0 or 1)
+    or extraterrestrial spectrum (ISPCTR = 0) files between runs. Results
+    stored in the ``set_cache`` folder are removed too.
+    '''
+    _smartsAll.cache_clear()
+    if _DISK_CACHE['path'] is not None:
+        for name in os.listdir(_DISK_CACHE['path']):
+            if re.fullmatch(r'[0-9a-f]{40}\.npz', name):
+                os.remove(os.path.join(_DISK_CACHE['path'], name))
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+import pytest
+
+import pySMARTS
+
+
+# Stand-in for the SMARTS executable: logs the input deck it was given and
+# writes a small output file whose values depend on the deck. A deck whose
+# comment (Card 1) contains FAIL produces no output, like an invalid card.
+FAKE_SMARTS = r'''#!{python}
+import hashlib, json, os
+deck = open('smarts295.inp.txt').read()
+with open(os.environ['FAKE_SMARTS_LOG'], 'a') as f:
+    f.write(json.dumps(deck) + '\n')
+lines = deck.split('\n')
+if 'FAIL' in lines[0]:
+    raise SystemExit(0)
+names = []
+for a, b in zip(lines, lines[1:]):
+    b = b.split()
+    if a.strip().isdigit() and b and len(b) == int(a) and all(t.isdigit() for t in b):
+        names = b
+h = int(hashlib.md5(deck.encode()).hexdigest()[:6], 16)
+with open('smarts295.ext.txt', 'w') as f:
+    f.write(' '.join(['Wvlgth'] + ['Out_' + n for n in names]) + '\n')
+    for k, w in enumerate([280, 280.5, 281, 300, 400, 401, 1700, 1705, 3000, 4000]):
+        f.write(' '.join(['%.1f' % w] + ['%.4E' % (((h + 31*k + 7*j) % 997) / 1000.0)
+                                        for j in range(len(names))]) + '\n')
+'''
+
+
+class FakeSMARTS:
+    def __init__(self, path, log):
+        self.path = str(path)
+        self.log = log
+
+    @property
+    def decks(self):
+        r''' Input decks of all the runs so far, oldest first. '''
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text().splitlines()]
+
+
+@pytest.fixture
+def fake_smarts(tmp_path, monkeypatch):
+    if sys.platform == 'win32':
+        pytest.skip('the fake SMARTS executable is a Python script')
+
+    smartsdir = tmp_path / 'SMARTS'
+    (smartsdir / 'Albedo').mkdir(parents=True)
+    exe = smartsdir / 'smarts295bat'
+    exe.write_text(FAKE_SMARTS.format(python=sys.executable))
+    exe.chmod(0o755)
+
+    log = tmp_path / 'decks.jsonl'
+    monkeypatch.setenv('FAKE_SMARTS_LOG', str(log))
+    monkeypatch.delenv('SMARTSPATH', raising=False)
+    pySMARTS.set_cache(None)
+    pySMARTS.clear_cache()
+    yield FakeSMARTS(smartsdir, log)
+    pySMARTS.set_cache(None)
+    pySMARTS.clear_cache()
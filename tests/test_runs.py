@@ -0,0 +1,102 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pySMARTS
+from pySMARTS.main import _solar_position
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+with open(os.path.join(DATA_DIR, 'baseline_decks.json')) as f:
+    BASELINE = json.load(f)
+
+
+@pytest.mark.parametrize('case', BASELINE, ids=[c['function'] for c in BASELINE])
+def test_input_decks(fake_smarts, case):
+    # The input files written for SMARTS are unchanged from the original
+    # pySMARTS implementation.
+    func = getattr(pySMARTS, case['function'])
+    data = func(SMARTSPATH=fake_smarts.path, **case['kwargs'])
+
+    assert fake_smarts.decks == case['decks']
+    assert data.columns[0] == 'Wvlgth'
+    assert data['Wvlgth'].dtype == np.float64
+    assert (data.dtypes[1:] == np.float32).all()
+
+
+def test_memory_cache(fake_smarts):
+    first = pySMARTS.SMARTSAirMass('30', 'Grass', '1.5', SMARTSPATH=fake_smarts.path)
+    # Equivalent spellings of the same inputs share one run.
+    again = pySMARTS.SMARTSAirMass('30', 'Grass', 1.50, SMARTSPATH=fake_smarts.path)
+    assert len(fake_smarts.decks) == 1
+    pd.testing.assert_frame_equal(first, again)
+
+    # Callers get a copy they can modify.
+    again.iloc[:, 1] = -1
+    pd.testing.assert_frame_equal(first, pySMARTS.SMARTSAirMass('30', 'Grass', '1.5', SMARTSPATH=fake_smarts.path))
+
+    pySMARTS.clear_cache()
+    pySMARTS.SMARTSAirMass('30', 'Grass', '1.5', SMARTSPATH=fake_smarts.path)
+    assert len(fake_smarts.decks) == 2
+
+
+def test_disk_cache(fake_smarts, tmp_path):
+    cachedir = tmp_path / 'cache'
+    pySMARTS.set_cache(str(cachedir), round_ndigits={'AMASS': 1})
+    first = pySMARTS.SMARTSAirMass('30', 'Grass', '1.52', SMARTSPATH=fake_smarts.path)
+    assert len(os.listdir(cachedir)) == 1
+
+    # A new session only finds the result on disk; 1.49 rounds to the same
+    # air mass.
+    pySMARTS.main._smartsAll.cache_clear()
+    again = pySMARTS.SMARTSAirMass('30', 'Grass', '1.49', SMARTSPATH=fake_smarts.path)
+    assert len(fake_smarts.decks) == 1
+    pd.testing.assert_frame_equal(first, again)
+
+    pySMARTS.clear_cache()
+    assert os.listdir(cachedir) == []
+
+
+def test_failed_run(fake_smarts):
+    cfg = pySMARTS.SMARTSConfig()._replace(CMNT='FAIL', IMASS='2', AMASS='1.5', IOUT='30')
+    with pytest.warns(UserWarning, match='did not produce any output'):
+        assert pySMARTS.SMARTSRunMany([cfg], SMARTSPATH=fake_smarts.path, n_jobs=1) == [None]
+
+
+def test_run_many(fake_smarts):
+    configs = [pySMARTS.SMARTSConfig()._replace(IMASS='2', AMASS=str(am), IOUT='2 3')
+               for am in (1.0, 1.5, 2.0, 3.0)]
+    parallel = pySMARTS.SMARTSRunMany(configs, SMARTSPATH=fake_smarts.path, n_jobs=4)
+    pySMARTS.clear_cache()
+    serial = pySMARTS.SMARTSRunMany(configs, SMARTSPATH=fake_smarts.path, n_jobs=1)
+
+    assert len(parallel) == len(configs)
+    for p, s in zip(parallel, serial):
+        pd.testing.assert_frame_equal(p, s)
+
+
+def test_air_mass_materials(fake_smarts):
+    materials = ['Grass', 'Snow', 'Concrete']
+    data = pySMARTS.SMARTSAirMassMaterials('30', materials, SMARTSPATH=fake_smarts.path, n_jobs=2)
+    assert list(data) == materials
+    assert len(fake_smarts.decks) == 3
+
+
+def test_time_location_batch_precompute(fake_smarts):
+    times = pd.DataFrame({'YEAR': [2021, 2021], 'MONTH': [6, 12], 'DAY': [21, 21],
+                          'HOUR': [9.5, 14.0]}, index=['summer', 'winter'])
+    data = pySMARTS.SMARTSTimeLocationBatch('2 3', times, '39.74', '-105.17', '1.8', '-7',
+                                            SMARTSPATH=fake_smarts.path, precompute_sun=True)
+    assert list(data.index.levels[0]) == ['summer', 'winter']
+
+    zenith, azimuth, suncor = _solar_position(times['YEAR'], times['MONTH'], times['DAY'],
+                                              times['HOUR'], 39.74, -105.17, -7)
+    for deck, z, a, c in zip(fake_smarts.decks, zenith, azimuth, suncor):
+        lines = deck.split('\n')
+        # Card 17 (IMASS) and 17a close the deck, and SUNCOR goes on Card 11.
+        assert lines[-4:-2] == ['0', '{:.4f} {:.4f}'.format(z, a)]
+        assert '280 4000 {:.5f} 1367.0'.format(c) in lines
@@ -0,0 +1,122 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pySMARTS
+from pySMARTS.main import _NATIVE_STEPS, _solar_position
+
+
+def test_band_average_linear():
+    # The trapezoidal average of a straight line is its value at the middle
+    # of the band, whatever the wavelength steps.
+    wl = np.concatenate([np.arange(280, 400, 0.5), np.arange(400, 1700, 1.0), np.arange(1700, 4001, 5.0)])
+    y = np.column_stack([2*wl + 1, np.full_like(wl, 3.0)])
+    np.testing.assert_allclose(pySMARTS.band_average(wl, y, 300, 2000), [2*1150 + 1, 3.0])
+    np.testing.assert_allclose(pySMARTS.band_average(wl, y[:, 0], 300, 2000), 2*1150 + 1)
+
+
+def test_band_means():
+    rng = np.random.default_rng(0)
+    wl = np.arange(280, 4000, 0.5)
+    y = rng.random((len(wl), 3))
+    bands = [(300, 2995), (295, 384.5), (280, 3999.5), (400, 400), (1000, 500), (5000, 6000)]
+    means = pySMARTS.band_means(wl, y, bands)
+
+    assert means.shape == (len(bands), 3)
+    for (lo, hi), row in zip(bands, means):
+        inside = (wl >= lo) & (wl <= hi)
+        if inside.any():
+            np.testing.assert_allclose(row, y[inside].mean(axis=0))
+        else:
+            assert np.isnan(row).all()
+
+
+def test_ffill_align():
+    src_x = np.array([300.0, 301.0, 305.0])
+    src_y = np.array([1.0, 2.0, 3.0])
+    out = pySMARTS.ffill_align(src_x, src_y, np.array([299.5, 300.0, 300.5, 304.5, 305.0, 310.0]))
+    np.testing.assert_array_equal(out, [np.nan, 1.0, 1.0, 2.0, 3.0, 3.0])
+
+    expected = pd.Series(src_y, index=src_x).reindex(pySMARTS.WL_HALF_NM_GRID, method='ffill')
+    np.testing.assert_array_equal(pySMARTS.ffill_align(src_x, src_y, pySMARTS.WL_HALF_NM_GRID), expected)
+
+
+def _lut():
+    zeniths = np.array([0.0, 30.0, 60.0])
+    azimuths = np.array([90.0, 180.0, 270.0])
+    wl = np.array([300.0, 400.0])
+    # Values linear in zenith and azimuth, so bilinear interpolation is exact.
+    z, a = np.meshgrid(zeniths, azimuths, indexing='ij')
+    values = np.stack([z + a, 2*z - a], axis=-1)[:, :, None, :] * np.array([1.0, 0.5])[None, None, :, None]
+    return pySMARTS.SpectralLUT(zeniths, azimuths, wl, values.astype(np.float32), ['a', 'b'])
+
+
+def test_spectral_lut():
+    lut = _lut()
+    np.testing.assert_array_equal(lut(30, 180), lut.values[1, 1])
+    np.testing.assert_allclose(lut(45, 225), [[45 + 225, 90 - 225], [(45 + 225)/2, (90 - 225)/2]])
+
+    # Several positions at once.
+    out = lut(np.array([15.0, 45.0]), np.array([135.0, 225.0]))
+    assert out.shape == (2, 2, 2)
+    np.testing.assert_allclose(out[1], lut(45, 225))
+
+    # Positions outside the grid take the value at its edge.
+    np.testing.assert_array_equal(lut(80, 300), lut(60, 270))
+    np.testing.assert_array_equal(lut(-5, 10), lut(0, 90))
+
+
+def test_native_grid():
+    # The default wavelengths of material_albedo are the ones SMARTS
+    # calculates on, as in the ASTM G173 spectra.
+    astm = pd.read_csv(os.path.join(os.path.dirname(pySMARTS.__file__), 'data', 'astmg173.csv'), skiprows=1)
+    grid = np.concatenate([np.arange(lo, hi, step) for lo, hi, step in _NATIVE_STEPS] + [[_NATIVE_STEPS[-1][1]]])
+    np.testing.assert_array_equal(grid, astm.iloc[:, 0])
+
+
+def test_material_albedo(tmp_path, monkeypatch):
+    monkeypatch.delenv('SMARTSPATH', raising=False)
+    (tmp_path / 'Albedo').mkdir()
+    (tmp_path / 'Albedo' / 'Grass.DAT').write_text('Grass reflectance\n0.3 0.1\n0.5 0.3\n1.0 0.5\n')
+
+    data = pySMARTS.material_albedo('Grass', SMARTSPATH=str(tmp_path))
+    assert len(data) == 2002
+    assert data['Zonal_ground_reflectance'].dtype == np.float32
+
+    data = pySMARTS.material_albedo('Grass', [250, 300, 400, 750, 2000], SMARTSPATH=str(tmp_path))
+    np.testing.assert_allclose(data['Zonal_ground_reflectance'], [0.1, 0.1, 0.2, 0.4, 0.5], rtol=1e-6)
+
+    # Water has no table (SMARTS calculates its reflectance), nor does Snow
+    # in this folder.
+    for material in ('Water', 'Snow'):
+        with pytest.warns(UserWarning, match='No reflectance table'):
+            assert pySMARTS.material_albedo(material, SMARTSPATH=str(tmp_path)) is None
+
+
+def test_solar_position():
+    pvlib = pytest.importorskip('pvlib')
+
+    rng = np.random.default_rng(0)
+    n = 500
+    utc = pd.Timestamp('2021-01-01', tz='UTC') + pd.to_timedelta(rng.uniform(0, 365*86400, n), unit='s')
+    lat = rng.uniform(-60, 60, n)
+    lon = rng.uniform(-180, 180, n)
+    zone = np.round(lon/15)
+    local = utc.tz_localize(None) + pd.to_timedelta(zone, unit='h')
+    hour = local.hour + local.minute/60 + local.second/3600
+
+    zenith, azimuth, suncor = _solar_position(local.year, local.month, local.day, hour, lat, lon, zone)
+    spa = [pvlib.solarposition.get_solarposition(t, la, lo).iloc[0] for t, la, lo in zip(utc, lat, lon)]
+    spa = pd.DataFrame(spa)
+    distance = pvlib.solarposition.nrel_earthsun_distance(utc).to_numpy()
+
+    # The NOAA (Spencer) series are within about 0.5 deg of the NREL SPA in
+    # declination, and the azimuth error grows near the zenith.
+    day = spa['apparent_zenith'].to_numpy() < 85
+    np.testing.assert_allclose(zenith[day], spa['apparent_zenith'][day], atol=1.0)
+    steep = day & (spa['apparent_zenith'].to_numpy() > 10)
+    dazim = (azimuth - spa['azimuth'].to_numpy() + 180) % 360 - 180
+    assert np.abs(dazim[steep]).max() < 5.0
+    np.testing.assert_allclose(suncor, 1/distance**2, rtol=2e-3)